@@ -1,9 +1,9 @@
 """LLM-based response composer for formatting extracted data into components."""
 
-import json
 import logging
 from typing import Any
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
@@ -18,12 +18,14 @@ from democrata_server.domain.rag.entities import (
     TextFormat,
 )
 
-from democrata_server.adapters.llm.components import parse_component
+from democrata_server.adapters.llm.components import extract_json, parse_components
 
 from .prompts.composer import COMPOSER_PROMPT
 
 logger = logging.getLogger(__name__)
 
+_DATA_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
 
 class LLMResponseComposer:
     """Response composer that uses an LLM to format extracted data into components."""
@@ -100,7 +102,7 @@ class LLMResponseComposer:
             extracted_data_parts.append(
                 f"## {extraction.component_type}\n"
                 f"Completeness: {extraction.completeness}\n"
-                f"Data: {json.dumps(extraction.extracted_data, indent=2)}\n"
+                f"Data: {orjson.dumps(extraction.extracted_data, option=_DATA_OPTIONS).decode()}\n"
                 f"Warnings: {extraction.warnings}"
             )
         extracted_data_str = "\n\n".join(extracted_data_parts)
@@ -115,33 +117,21 @@ class LLMResponseComposer:
     def _parse_response(self, content: str) -> tuple[Layout, list[Component]]:
         """Parse LLM response into Layout and Components."""
         try:
-            json_str = self._extract_json(content)
-            data = json.loads(json_str)
+            data = orjson.loads(extract_json(content))
             return self._build_layout_from_data(data)
-        except (json.JSONDecodeError, IndexError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             logger.warning(f"Failed to parse composer response: {e}")
             return self._fallback_layout(content)
 
-    def _extract_json(self, content: str) -> str:
-        """Extract JSON from response, handling markdown code blocks."""
-        if "```json" in content:
-            return content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            return content.split("```")[1].split("```")[0]
-        return content
-
     def _build_layout_from_data(self, data: dict) -> tuple[Layout, list[Component]]:
         """Build Layout and Components from parsed JSON data."""
         components: list[Component] = []
         sections: list[Section] = []
 
         for section_data in data.get("sections", []):
-            component_ids = []
-            for comp_data in section_data.get("components", []):
-                component = parse_component(comp_data)
-                if component:
-                    components.append(component)
-                    component_ids.append(component.id)
+            section_components = parse_components(section_data.get("components", []))
+            components.extend(section_components)
+            component_ids = [component.id for component in section_components]
 
             # Skip sections with no valid components
             if not component_ids:
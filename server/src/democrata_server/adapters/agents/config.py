@@ -17,6 +17,9 @@ class AgentConfig:
     # Feature flags
     verifier_enabled: bool
 
+    # Maximum concurrent verifier LLM calls per process
+    verifier_max_concurrency: int
+
     # API configuration
     openai_api_key: str | None
     openai_base_url: str | None
@@ -36,6 +39,7 @@ class AgentConfig:
             verifier_model=os.getenv("AGENT_VERIFIER_MODEL", "gpt-4o-mini"),
             # Feature flags
             verifier_enabled=os.getenv("AGENT_VERIFIER_ENABLED", "true").lower() == "true",
+            verifier_max_concurrency=int(os.getenv("AGENT_VERIFIER_MAX_CONCURRENCY", "16")),
             # API configuration
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             openai_base_url=os.getenv("OPENAI_BASE_URL"),
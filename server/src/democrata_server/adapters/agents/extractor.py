@@ -32,17 +32,23 @@ class LLMDataExtractor:
         self.base_url = base_url
         self.model = model
         self.temperature = temperature
+        # One client shared by all component types so its connection pool is reused
+        self._base_llm = ChatOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            temperature=temperature,
+        )
+        self._structured_llms: dict[str, Any] = {}
 
     def _get_structured_llm(self, component_type: str) -> Any:
         """Get an LLM configured with structured output for the given component type."""
-        schema = get_extraction_schema(component_type)
-        base_llm = ChatOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-            model=self.model,
-            temperature=self.temperature,
-        )
-        return base_llm.with_structured_output(schema)
+        structured_llm = self._structured_llms.get(component_type)
+        if structured_llm is None:
+            schema = get_extraction_schema(component_type)
+            structured_llm = self._base_llm.with_structured_output(schema)
+            self._structured_llms[component_type] = structured_llm
+        return structured_llm
 
     async def extract(
         self,
@@ -1,5 +1,6 @@
 """Factory functions for creating agent instances."""
 
+from functools import lru_cache
 from typing import Any
 
 from democrata_server.domain.agents.ports import (
@@ -8,7 +9,7 @@ from democrata_server.domain.agents.ports import (
     ResponseComposer,
     ResponseVerifier,
 )
-from democrata_server.domain.rag.ports import ContextRetriever
+from democrata_server.domain.rag.ports import Cache, ContextRetriever
 
 from .config import AgentConfig
 from .composer import LLMResponseComposer
@@ -18,9 +19,20 @@ from .retriever import IntentDrivenRetriever
 from .verifier import LLMResponseVerifier
 
 
+@lru_cache(maxsize=1)
+def _default_config() -> AgentConfig:
+    """Load the environment config once for callers that don't pass one."""
+    return AgentConfig.from_env()
+
+
+def reset_caches() -> None:
+    """Forget the cached default config, e.g. after changing env vars in tests."""
+    _default_config.cache_clear()
+
+
 def create_query_planner(config: AgentConfig | None = None) -> QueryPlanner:
     """Create a query planner instance."""
-    config = config or AgentConfig.from_env()
+    config = config or _default_config()
 
     return LLMQueryPlanner(
         api_key=config.openai_api_key,
@@ -32,7 +44,7 @@ def create_query_planner(config: AgentConfig | None = None) -> QueryPlanner:
 
 def create_data_extractor(config: AgentConfig | None = None) -> DataExtractor:
     """Create a data extractor instance."""
-    config = config or AgentConfig.from_env()
+    config = config or _default_config()
 
     return LLMDataExtractor(
         api_key=config.openai_api_key,
@@ -44,7 +56,7 @@ def create_data_extractor(config: AgentConfig | None = None) -> DataExtractor:
 
 def create_response_composer(config: AgentConfig | None = None) -> ResponseComposer:
     """Create a response composer instance."""
-    config = config or AgentConfig.from_env()
+    config = config or _default_config()
 
     return LLMResponseComposer(
         api_key=config.openai_api_key,
@@ -54,9 +66,12 @@ def create_response_composer(config: AgentConfig | None = None) -> ResponseCompo
     )
 
 
-def create_response_verifier(config: AgentConfig | None = None) -> ResponseVerifier | None:
+def create_response_verifier(
+    config: AgentConfig | None = None,
+    cache: Cache | None = None,
+) -> ResponseVerifier | None:
     """Create a response verifier instance if enabled."""
-    config = config or AgentConfig.from_env()
+    config = config or _default_config()
 
     if not config.verifier_enabled:
         return None
@@ -66,6 +81,8 @@ def create_response_verifier(config: AgentConfig | None = None) -> ResponseVerif
         base_url=config.openai_base_url,
         model=config.verifier_model,
         temperature=0.1,  # Low temperature for consistent verification
+        cache=cache,
+        max_concurrency=config.verifier_max_concurrency,
     )
 
 
@@ -75,7 +92,7 @@ def create_context_retriever(
     config: AgentConfig | None = None,
 ) -> ContextRetriever:
     """Create a context retriever instance."""
-    config = config or AgentConfig.from_env()
+    config = config or _default_config()
 
     return IntentDrivenRetriever(
         embedder=embedder,
@@ -3,7 +3,7 @@
 from .composer import COMPOSER_PROMPT
 from .extractor import EXTRACTION_PROMPTS, GENERIC_EXTRACTION_PROMPT
 from .planner import PLANNER_PROMPT
-from .verifier import VERIFIER_PROMPT
+from .verifier import VERIFIER_PROMPT, VERIFIER_SYSTEM_PROMPT
 
 __all__ = [
     "PLANNER_PROMPT",
@@ -11,4 +11,5 @@ __all__ = [
     "GENERIC_EXTRACTION_PROMPT",
     "COMPOSER_PROMPT",
     "VERIFIER_PROMPT",
+    "VERIFIER_SYSTEM_PROMPT",
 ]
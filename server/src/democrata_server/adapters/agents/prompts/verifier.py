@@ -1,6 +1,8 @@
 """Response verifier prompt for checking claims against source context."""
 
-VERIFIER_PROMPT = """You are a fact-checker for an Australian political information system.
+# Static instructions are sent as the system message so the prompt prefix is
+# identical across calls and can be served from the provider's prompt cache.
+VERIFIER_SYSTEM_PROMPT = """You are a fact-checker for an Australian political information system.
 Verify that claims in the response are supported by the source context.
 
 VERIFICATION RULES:
@@ -10,34 +12,34 @@ VERIFICATION RULES:
 4. Entity names must match (party names, politician names, bill names)
 5. Opinions or analysis should be flagged if not supported
 
-SOURCE CONTEXT:
-{context}
-
-RESPONSE TO VERIFY:
-{response}
-
 For each claim in the response, determine:
 - SUPPORTED: Exact or close match found in context
 - UNSUPPORTED: No evidence in context
 - PARTIAL: Some parts supported, others not
 
 OUTPUT FORMAT (JSON only):
-{{
+{
   "is_valid": true|false,
   "unsupported_claims": [
-    {{
+    {
       "claim_text": "the unsupported claim",
       "component_id": "component id if identifiable",
       "severity": "warning|error",
       "reason": "why this is unsupported"
-    }}
+    }
   ],
   "confidence_score": 0.0-1.0,
   "warnings": ["general verification warnings"]
-}}
+}
 
 SEVERITY GUIDELINES:
 - error: Numerical values, vote counts, dates that don't match
-- warning: Characterizations, interpretations, minor discrepancies
+- warning: Characterizations, interpretations, minor discrepancies"""
+
+VERIFIER_PROMPT = """SOURCE CONTEXT:
+{context}
+
+RESPONSE TO VERIFY:
+{response}
 
 Respond with JSON only:"""
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EntitiesSchema(BaseModel):
@@ -163,6 +165,33 @@ class GenericExtractionSchema(BaseExtractionSchema):
     data: dict = Field(default_factory=dict, description="Extracted data")
 
 
+class UnsupportedClaimSchema(BaseModel):
+    """A claim in the response that the context does not support."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    claim_text: str = Field(description="The unsupported claim")
+    component_id: str | None = Field(description="Component id if identifiable")
+    severity: Literal["warning", "error"] = Field(description="Claim severity")
+    reason: str = Field(description="Why this is unsupported")
+
+
+class VerifierOutputSchema(BaseModel):
+    """
+    Schema for response verifier output.
+
+    Every field is required and extra fields are forbidden so the JSON schema
+    is accepted by OpenAI's strict structured output mode.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    is_valid: bool = Field(description="Whether all claims are supported")
+    unsupported_claims: list[UnsupportedClaimSchema] = Field(description="Unsupported claims")
+    confidence_score: float = Field(description="Confidence score 0-1")
+    warnings: list[str] = Field(description="General verification warnings")
+
+
 # Mapping from component type to schema
 EXTRACTION_SCHEMAS: dict[str, type[BaseExtractionSchema]] = {
     "text_block": TextBlockExtractionSchema,
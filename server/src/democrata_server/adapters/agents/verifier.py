@@ -1,22 +1,94 @@
 """LLM-based response verifier for checking claims against source context."""
 
-import json
+import asyncio
 import logging
+import re
+from collections.abc import Callable
 from typing import Any
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+import orjson
+import xxhash
+from openai import AsyncOpenAI
 
 from democrata_server.domain.agents.entities import (
     UnsupportedClaim,
     VerificationResult,
 )
-from democrata_server.domain.rag.entities import Component, Layout
+from democrata_server.domain.rag.entities import (
+    Chart,
+    Comparison,
+    Component,
+    DataTable,
+    Layout,
+    MemberProfiles,
+    Notice,
+    TextBlock,
+    Timeline,
+    VotingBreakdown,
+)
+from democrata_server.domain.rag.ports import Cache
 
-from .prompts.verifier import VERIFIER_PROMPT
+from .prompts.verifier import VERIFIER_PROMPT, VERIFIER_SYSTEM_PROMPT
+from .schemas import VerifierOutputSchema
 
 logger = logging.getLogger(__name__)
 
+VERIFICATION_CACHE_TTL_SECONDS = 600
+# Routes verifier requests to the same OpenAI prompt cache shard
+PROMPT_CACHE_KEY = "verifier-v1"
+
+# Constrains the model to emit JSON matching VerifierOutputSchema
+VERIFIER_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "verification_result",
+        "schema": VerifierOutputSchema.model_json_schema(),
+        "strict": True,
+    },
+}
+
+_SYSTEM_MESSAGE = {"role": "system", "content": VERIFIER_SYSTEM_PROMPT}
+
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Body of the first markdown code fence, with or without a json tag
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def _serialize_timeline(content: Timeline) -> str:
+    events_text = "; ".join(f"{e.date}: {e.label}" for e in content.events)
+    return f"[Timeline] Events: {events_text}"
+
+
+def _serialize_chart(content: Chart) -> str:
+    series_text = "; ".join(f"{s.name}: {[d.value for d in s.data]}" for s in content.series)
+    return f"[Chart] Data: {series_text}"
+
+
+def _serialize_comparison(content: Comparison) -> str:
+    attrs_text = "; ".join(f"{a.name}: {a.values}" for a in content.attributes)
+    return f"[Comparison] {attrs_text}"
+
+
+def _serialize_members(content: MemberProfiles) -> str:
+    members_text = ", ".join(m.name for m in content.members)
+    return f"[MemberProfiles] Members: {members_text}"
+
+
+# Component content type -> verification text
+_SERIALIZERS: dict[type, Callable[[Any], str]] = {
+    TextBlock: lambda c: "[TextBlock] " + c.content,
+    Notice: lambda c: "[Notice] " + c.message,
+    VotingBreakdown: lambda c: (
+        f"[VotingBreakdown] Votes: {c.total_for} for, {c.total_against} against"
+    ),
+    Timeline: _serialize_timeline,
+    Chart: _serialize_chart,
+    Comparison: _serialize_comparison,
+    DataTable: lambda c: f"[DataTable] {len(c.rows)} rows",
+    MemberProfiles: _serialize_members,
+}
+
 
 class LLMResponseVerifier:
     """Response verifier that uses an LLM to check claims against source context."""
@@ -27,14 +99,29 @@ class LLMResponseVerifier:
         base_url: str | None = None,
         model: str = "gpt-4o-mini",
         temperature: float = 0.1,
+        cache: Cache | None = None,
+        cache_ttl_seconds: int = VERIFICATION_CACHE_TTL_SECONDS,
+        max_concurrency: int = 16,
     ):
-        self.llm = ChatOpenAI(
+        # Called directly rather than through LangChain: the prompt and output
+        # contract are fixed, so the message/retry wrappers only add overhead
+        self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
-            model=model,
-            temperature=temperature,
+            max_retries=2,
+            timeout=15.0,
         )
         self.model = model
+        self.temperature = temperature
+        # Only OpenAI itself understands prompt_cache_key
+        self._extra_body = None if base_url else {"prompt_cache_key": PROMPT_CACHE_KEY}
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Bounds concurrent LLM calls to stay within provider rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: dict[str, asyncio.Future[VerificationResult]] = {}
 
     async def verify(
         self,
@@ -48,6 +135,58 @@ class LLMResponseVerifier:
 
         # Serialize response for verification
         response_text = self._serialize_response(layout, components)
+        key = self._cache_key(response_text, context)
+
+        if self.cache is not None:
+            try:
+                cached = await self.cache.get(key)
+            except Exception as e:
+                # A cache outage shouldn't fail a response that was already generated
+                logger.warning(f"Verification cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                self.cache_hits += 1
+                logger.debug(
+                    "Verification cache hit (%d hits, %d misses)",
+                    self.cache_hits,
+                    self.cache_misses,
+                )
+                return cached
+            self.cache_misses += 1
+
+        # Identical verifications already running share a single LLM call
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future: asyncio.Future[VerificationResult] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._run_verification(response_text, context)
+        except Exception as e:
+            logger.warning(f"Verification failed: {e}")
+            result = VerificationResult(
+                is_valid=True,  # Default to valid if verification fails
+                warnings=[f"Verification skipped: {e}"],
+            )
+            future.set_result(result)
+            return result
+        else:
+            future.set_result(result)
+        finally:
+            del self._in_flight[key]
+            if not future.done():
+                future.cancel()
+
+        if self.cache is not None:
+            try:
+                await self.cache.set(key, result, self.cache_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Verification cache write failed: {e}")
+        return result
+
+    def _build_messages(self, response_text: str, context: list[str]) -> list[dict[str, str]]:
+        """Build the chat messages for verifying a serialized response."""
         context_text = "\n\n---\n\n".join(context)
 
         prompt = VERIFIER_PROMPT.format(
@@ -55,22 +194,112 @@ class LLMResponseVerifier:
             response=response_text,
         )
 
-        messages = [
-            SystemMessage(content="You are a fact-checker. Verify claims against the source context. Output JSON only."),
-            HumanMessage(content=prompt),
+        return [
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": prompt},
         ]
 
-        try:
-            response = await self.llm.ainvoke(messages)
-            content = response.content
-            return self._parse_verification(content)
-        except Exception as e:
-            logger.warning(f"Verification failed: {e}")
-            return VerificationResult(
-                is_valid=True,  # Default to valid if verification fails
-                warnings=[f"Verification skipped: {e}"],
+    async def _run_verification(
+        self, response_text: str, context: list[str]
+    ) -> VerificationResult:
+        """Call the LLM to verify a serialized response against context."""
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                messages=self._build_messages(response_text, context),
+                response_format=VERIFIER_RESPONSE_FORMAT,
+                extra_body=self._extra_body,
+            )
+        return self._parse_verification(response.choices[0].message.content or "")
+
+    async def verify_batch(
+        self,
+        items: list[tuple[Layout, list[Component], list[str]]],
+        poll_interval_seconds: float = 60.0,
+    ) -> list[VerificationResult]:
+        """
+        Verify many responses through the OpenAI Batch API.
+
+        Intended for background work where latency doesn't matter: batch requests
+        are billed at a discount and complete within 24 hours. Results are
+        returned in item order; items that fail default to valid with a warning,
+        as in verify().
+        """
+        results: list[VerificationResult | None] = [None] * len(items)
+        lines = []
+        for index, (layout, components, context) in enumerate(items):
+            if not context:
+                results[index] = VerificationResult.valid()  # Can't verify without context
+                continue
+            body = {
+                "model": self.model,
+                "temperature": self.temperature,
+                "messages": self._build_messages(
+                    self._serialize_response(layout, components), context
+                ),
+                "response_format": VERIFIER_RESPONSE_FORMAT,
+            }
+            lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": str(index),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": body,
+                    }
+                )
             )
 
+        status = "completed"
+        if lines:
+            input_file = await self.client.files.create(
+                file=("verifier-batch.jsonl", b"\n".join(lines)),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            while batch.status not in _BATCH_FINAL_STATUSES:
+                await asyncio.sleep(poll_interval_seconds)
+                batch = await self.client.batches.retrieve(batch.id)
+            status = batch.status
+
+            if batch.output_file_id:
+                output = await self.client.files.content(batch.output_file_id)
+                for line in output.content.splitlines():
+                    record = orjson.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") != 200:
+                        continue
+                    content = response["body"]["choices"][0]["message"]["content"] or ""
+                    results[int(record["custom_id"])] = self._parse_verification(content)
+
+        return [
+            result
+            if result is not None
+            else VerificationResult(
+                is_valid=True,
+                warnings=[f"Verification skipped: batch request {status}"],
+            )
+            for result in results
+        ]
+
+    def _cache_key(self, response_text: str, context: list[str]) -> str:
+        """Build a content-addressed cache key for a response/context pair."""
+        # xxh3 is non-cryptographic but the inputs are model output and retrieved
+        # context rather than raw user input, and it's far faster on multi-KB contexts
+        hasher = xxhash.xxh3_128()
+        hasher.update(self.model.encode("utf-8"))
+        hasher.update(b"\x00")
+        hasher.update(response_text.encode("utf-8"))
+        for chunk in context:
+            hasher.update(b"\x00")
+            hasher.update(chunk.encode("utf-8"))
+        return f"verify:v2:{hasher.hexdigest()}"
+
     def _serialize_response(self, layout: Layout, components: list[Component]) -> str:
         """Serialize layout and components to text for verification."""
         parts = []
@@ -80,52 +309,28 @@ class LLMResponseVerifier:
         if layout.subtitle:
             parts.append(f"Subtitle: {layout.subtitle}")
 
+        append = parts.append
         for component in components:
             content = component.content
-            content_type = type(content).__name__
-
-            # Serialize component content based on type
-            if hasattr(content, "content"):  # TextBlock
-                parts.append(f"[{content_type}] {content.content}")
-            elif hasattr(content, "message"):  # Notice
-                parts.append(f"[{content_type}] {content.message}")
-            elif hasattr(content, "total_for"):  # VotingBreakdown
-                parts.append(
-                    f"[{content_type}] Votes: {content.total_for} for, "
-                    f"{content.total_against} against"
-                )
-            elif hasattr(content, "events"):  # Timeline
-                events_text = "; ".join(
-                    f"{e.date}: {e.label}" for e in content.events
-                )
-                parts.append(f"[{content_type}] Events: {events_text}")
-            elif hasattr(content, "series"):  # Chart
-                series_text = "; ".join(
-                    f"{s.name}: {[d.value for d in s.data]}" for s in content.series
-                )
-                parts.append(f"[{content_type}] Data: {series_text}")
-            elif hasattr(content, "attributes"):  # Comparison
-                attrs_text = "; ".join(
-                    f"{a.name}: {a.values}" for a in content.attributes
-                )
-                parts.append(f"[{content_type}] {attrs_text}")
-            elif hasattr(content, "rows"):  # DataTable
-                parts.append(f"[{content_type}] {len(content.rows)} rows")
-            elif hasattr(content, "members"):  # MemberProfiles
-                members_text = ", ".join(m.name for m in content.members)
-                parts.append(f"[{content_type}] Members: {members_text}")
+            serialize = _SERIALIZERS.get(type(content))
+            if serialize is None:
+                append(f"[{type(content).__name__}] (content)")
             else:
-                parts.append(f"[{content_type}] (content)")
+                append(serialize(content))
 
         return "\n".join(parts)
 
     def _parse_verification(self, content: str) -> VerificationResult:
         """Parse LLM response into VerificationResult."""
         try:
-            json_str = self._extract_json(content)
-            data = json.loads(json_str)
+            try:
+                # Structured output returns a bare object
+                data = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # OpenAI-compatible backends may ignore response_format
+                data = orjson.loads(self._extract_json(content))
             return self._build_verification_result(data)
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (KeyError, ValueError, AttributeError) as e:
             logger.warning(f"Failed to parse verification response: {e}")
             return VerificationResult(
                 is_valid=True,
@@ -134,11 +339,8 @@ class LLMResponseVerifier:
 
     def _extract_json(self, content: str) -> str:
         """Extract JSON from response, handling markdown code blocks."""
-        if "```json" in content:
-            return content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            return content.split("```")[1].split("```")[0]
-        return content
+        match = _FENCED_JSON_RE.search(content)
+        return match.group(1) if match else content
 
     def _build_verification_result(self, data: dict[str, Any]) -> VerificationResult:
         """Build VerificationResult from parsed JSON data."""
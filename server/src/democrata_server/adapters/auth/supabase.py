@@ -1,15 +1,31 @@
 """Supabase auth adapter implementing the AuthProvider protocol."""
 
+import base64
+import hashlib
 import logging
+import time
 from datetime import UTC, datetime
 from uuid import UUID
 
 import httpx
+import orjson
 
+from democrata_server.adapters.cache.memory import TTLCache
 from democrata_server.domain.auth.entities import Session, User
 
 logger = logging.getLogger(__name__)
 
+# Validated tokens are cached briefly so repeat requests skip the GoTrue round-trip.
+USER_CACHE_MAX_SIZE = 10_000
+USER_CACHE_TTL_SECONDS = 45.0
+INVALID_TOKEN_CACHE_TTL_SECONDS = 5.0
+# Tokens this close to expiry are never cached
+TOKEN_EXPIRY_MARGIN_SECONDS = 10.0
+# Admin user lookups (including "not found") are cached briefly
+USER_BY_ID_CACHE_TTL_SECONDS = 30.0
+
+_MISSING = object()
+
 
 class SupabaseAuthProvider:
     """
@@ -29,6 +45,28 @@ class SupabaseAuthProvider:
         self._anon_key = supabase_anon_key
         self._service_key = supabase_service_key
         self._auth_url = f"{self._supabase_url}/auth/v1"
+        self._client: httpx.AsyncClient | None = None
+        self._user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+        self._user_by_id_cache = TTLCache(
+            maxsize=USER_CACHE_MAX_SIZE, ttl=USER_BY_ID_CACHE_TTL_SECONDS
+        )
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._auth_url,
+                http2=True,
+                timeout=httpx.Timeout(5.0),
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
 
     def _get_headers(self, access_token: str | None = None) -> dict[str, str]:
         """Build headers for Supabase API requests."""
@@ -53,20 +91,17 @@ class SupabaseAuthProvider:
     def _parse_user(self, user_data: dict) -> User:
         """Parse Supabase user response into domain User entity."""
         user_meta = user_data.get("user_metadata", {})
+        # fromisoformat accepts the trailing "Z" natively on Python 3.11+
+        created_at = datetime.fromisoformat(user_data["created_at"])
+        updated_at = user_data.get("updated_at")
         return User(
             id=UUID(user_data["id"]),
             email=user_data["email"],
             name=user_meta.get("full_name") or user_meta.get("name"),
             avatar_url=user_meta.get("avatar_url"),
             email_verified=user_data.get("email_confirmed_at") is not None,
-            created_at=datetime.fromisoformat(
-                user_data["created_at"].replace("Z", "+00:00")
-            ),
-            updated_at=datetime.fromisoformat(
-                user_data.get("updated_at", user_data["created_at"]).replace(
-                    "Z", "+00:00"
-                )
-            ),
+            created_at=created_at,
+            updated_at=datetime.fromisoformat(updated_at) if updated_at else created_at,
         )
 
     def _parse_session(self, session_data: dict, user: User) -> Session:
@@ -79,30 +114,82 @@ class SupabaseAuthProvider:
             expires_at=datetime.fromtimestamp(expires_at_ts, tz=UTC),
         )
 
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        """Hash a token for use as a cache key so raw tokens are never stored."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @staticmethod
+    def _token_expiry(token: str) -> float | None:
+        """
+        Read the `exp` claim from a JWT without verifying it.
+
+        Only used to bound how long a validated token may be cached;
+        validation itself is always done by Supabase.
+        """
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            claims = orjson.loads(base64.urlsafe_b64decode(payload))
+            return float(claims["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def _user_cache_ttl(self, token: str) -> float:
+        """Get how long a validated token may be cached (0 means don't cache)."""
+        expires_at = self._token_expiry(token)
+        if expires_at is None:
+            return 0.0
+        remaining = expires_at - time.time() - TOKEN_EXPIRY_MARGIN_SECONDS
+        return max(0.0, min(USER_CACHE_TTL_SECONDS, remaining))
+
+    def _cache_user(self, token: str, user: User) -> None:
+        """Cache a validated user for a token, bounded by the token's expiry."""
+        ttl = self._user_cache_ttl(token)
+        if ttl > 0:
+            self._user_cache.set(self._token_cache_key(token), user, ttl=ttl)
+
+    def invalidate(self, token: str) -> None:
+        """Drop any cached validation result for a token, and its user lookup."""
+        cache_key = self._token_cache_key(token)
+        user = self._user_cache.get(cache_key)
+        if user is not None:
+            self._user_by_id_cache.delete(user.id)
+        self._user_cache.delete(cache_key)
+
     async def get_user(self, token: str) -> User | None:
         """
         Extract and validate user from an access token.
 
         Makes a request to Supabase's /user endpoint to validate the token
-        and retrieve the current user data.
+        and retrieve the current user data. Results are cached briefly per
+        token, including rejections, to avoid a round-trip on every request.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self._auth_url}/user",
-                    headers=self._get_headers(token),
-                )
-                if response.status_code == 401:
-                    logger.debug("Invalid or expired token")
-                    return None
-                response.raise_for_status()
-                return self._parse_user(response.json())
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"Failed to get user: {e}")
-                return None
-            except Exception as e:
-                logger.error(f"Unexpected error getting user: {e}")
+        cache_key = self._token_cache_key(token)
+        cached = self._user_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        client = await self._get_client()
+        try:
+            response = await client.get(
+                "/user",
+                headers=self._get_headers(token),
+            )
+            if response.status_code == 401:
+                logger.debug("Invalid or expired token")
+                self._user_cache.set(cache_key, None, ttl=INVALID_TOKEN_CACHE_TTL_SECONDS)
                 return None
+            response.raise_for_status()
+            user = self._parse_user(orjson.loads(response.content))
+            self._cache_user(token, user)
+            return user
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to get user: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error getting user: {e}")
+            return None
 
     async def verify_session(self, session_token: str) -> Session | None:
         """
@@ -130,27 +217,31 @@ class SupabaseAuthProvider:
 
         Returns a new Session with fresh access_token and refresh_token.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self._auth_url}/token?grant_type=refresh_token",
-                    headers=self._get_headers(),
-                    json={"refresh_token": refresh_token},
-                )
-                if response.status_code == 401:
-                    logger.debug("Invalid refresh token")
-                    return None
-                response.raise_for_status()
-
-                data = response.json()
-                user = self._parse_user(data["user"])
-                return self._parse_session(data, user)
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"Failed to refresh session: {e}")
-                return None
-            except Exception as e:
-                logger.error(f"Unexpected error refreshing session: {e}")
+        client = await self._get_client()
+        try:
+            response = await client.post(
+                "/token?grant_type=refresh_token",
+                headers=self._get_headers(),
+                json={"refresh_token": refresh_token},
+            )
+            if response.status_code == 401:
+                logger.debug("Invalid refresh token")
                 return None
+            response.raise_for_status()
+
+            data = orjson.loads(response.content)
+            user = self._parse_user(data["user"])
+            session = self._parse_session(data, user)
+            # The refresh response already identifies the user, so the client's
+            # next request with the new access token can skip validation
+            self._cache_user(session.access_token, user)
+            return session
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to refresh session: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error refreshing session: {e}")
+            return None
 
     async def sign_out(self, session_token: str) -> None:
         """
@@ -158,38 +249,47 @@ class SupabaseAuthProvider:
 
         This revokes the session on Supabase's side.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self._auth_url}/logout",
-                    headers=self._get_headers(session_token),
-                )
-                response.raise_for_status()
-                logger.debug("Session signed out successfully")
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"Failed to sign out: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error signing out: {e}")
+        self.invalidate(session_token)
+        client = await self._get_client()
+        try:
+            response = await client.post(
+                "/logout",
+                headers=self._get_headers(session_token),
+            )
+            response.raise_for_status()
+            logger.debug("Session signed out successfully")
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to sign out: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error signing out: {e}")
 
     async def get_user_by_id(self, user_id: UUID) -> User | None:
         """
         Get a user by ID using admin privileges.
 
-        Requires service_key to be configured.
+        Requires service_key to be configured. Results, including "not found",
+        are cached briefly.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self._auth_url}/admin/users/{user_id}",
-                    headers=self._get_admin_headers(),
-                )
-                if response.status_code == 404:
-                    return None
-                response.raise_for_status()
-                return self._parse_user(response.json())
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"Failed to get user by ID: {e}")
-                return None
-            except Exception as e:
-                logger.error(f"Unexpected error getting user by ID: {e}")
+        cached = self._user_by_id_cache.get(user_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        client = await self._get_client()
+        try:
+            response = await client.get(
+                f"/admin/users/{user_id}",
+                headers=self._get_admin_headers(),
+            )
+            if response.status_code == 404:
+                self._user_by_id_cache.set(user_id, None)
                 return None
+            response.raise_for_status()
+            user = self._parse_user(orjson.loads(response.content))
+            self._user_by_id_cache.set(user_id, user)
+            return user
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to get user by ID: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error getting user by ID: {e}")
+            return None
@@ -1,18 +1,48 @@
 """Stripe payment adapter implementing the PaymentProvider protocol."""
 
+import asyncio
 import hashlib
 import hmac
-import json
 import logging
 from datetime import UTC, datetime
+from functools import lru_cache
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 
+from democrata_server.adapters.cache.memory import TTLCache
 from democrata_server.domain.billing.entities import BillingAccount, CreditPack
 from democrata_server.domain.billing.ports import CheckoutSession, PaymentResult
 
 logger = logging.getLogger(__name__)
 
+# Webhook bodies above this size are verified and parsed in worker threads
+LARGE_WEBHOOK_PAYLOAD_BYTES = 32_768
+
+# Checkout sessions are re-polled around redirects and webhooks; cache lookups
+# briefly, and "not found" for less time since the session may appear shortly.
+CHECKOUT_SESSION_CACHE_TTL_SECONDS = 60.0
+MISSING_CHECKOUT_SESSION_CACHE_TTL_SECONDS = 10.0
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=64)
+def _encode_line_items(credit_pack: CreditPack) -> str:
+    """Form-encode the checkout line item for a credit pack (constant per pack)."""
+    return urlencode(
+        {
+            "line_items[0][quantity]": "1",
+            "line_items[0][price_data][currency]": "usd",
+            "line_items[0][price_data][unit_amount]": str(credit_pack.price_cents),
+            "line_items[0][price_data][product_data][name]": f"{credit_pack.credits} Credits",
+            "line_items[0][price_data][product_data][description]": (
+                f"Purchase {credit_pack.credits} query credits for Demócrata"
+            ),
+        }
+    )
+
 
 class StripePaymentProvider:
     """
@@ -30,8 +60,29 @@ class StripePaymentProvider:
     ):
         self._secret_key = secret_key
         self._webhook_secret = webhook_secret
+        # Keyed once; copying it per webhook skips re-deriving the HMAC key pads
+        self._hmac_template = hmac.new(webhook_secret.encode("utf-8"), digestmod=hashlib.sha256)
         self._api_version = api_version
         self._base_url = "https://api.stripe.com/v1"
+        self._client: httpx.AsyncClient | None = None
+        self._session_cache = TTLCache(maxsize=1_000, ttl=CHECKOUT_SESSION_CACHE_TTL_SECONDS)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=True,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
 
     def _get_headers(self) -> dict[str, str]:
         """Build headers for Stripe API requests."""
@@ -53,66 +104,66 @@ class StripePaymentProvider:
 
         Returns a CheckoutSession with the URL to redirect the user to.
         """
-        async with httpx.AsyncClient() as client:
-            # Build line items for the credit pack
-            data = {
-                "mode": "payment",
-                "success_url": success_url,
-                "cancel_url": cancel_url,
-                "metadata[billing_account_id]": str(billing_account.id),
-                "metadata[credits]": str(credit_pack.credits),
-                "line_items[0][quantity]": "1",
-                "line_items[0][price_data][currency]": "usd",
-                "line_items[0][price_data][unit_amount]": str(credit_pack.price_cents),
-                "line_items[0][price_data][product_data][name]": f"{credit_pack.credits} Credits",
-                "line_items[0][price_data][product_data][description]": (
-                    f"Purchase {credit_pack.credits} query credits for Demócrata"
-                ),
-            }
-
-            # Attach customer if we have a Stripe customer ID
-            if billing_account.stripe_customer_id:
-                data["customer"] = billing_account.stripe_customer_id
-            else:
-                # Create or retrieve customer email from metadata
-                owner_email = billing_account.user_id or billing_account.organization_id
-                data["customer_creation"] = "always"
-                data["metadata[owner_id]"] = str(owner_email)
-
-            response = await client.post(
-                f"{self._base_url}/checkout/sessions",
-                headers=self._get_headers(),
-                data=data,
-            )
-            response.raise_for_status()
-            session_data = response.json()
+        client = await self._get_client()
+
+        # Per-request fields; the line items are pre-encoded per credit pack
+        data = {
+            "mode": "payment",
+            "success_url": success_url,
+            "cancel_url": cancel_url,
+            "metadata[billing_account_id]": str(billing_account.id),
+            "metadata[credits]": str(credit_pack.credits),
+        }
 
-            return CheckoutSession(
-                session_id=session_data["id"],
-                url=session_data["url"],
-                expires_at=datetime.fromtimestamp(session_data["expires_at"], tz=UTC),
-            )
+        # Attach customer if we have a Stripe customer ID
+        if billing_account.stripe_customer_id:
+            data["customer"] = billing_account.stripe_customer_id
+        else:
+            # Create or retrieve customer email from metadata
+            owner_email = billing_account.user_id or billing_account.organization_id
+            data["customer_creation"] = "always"
+            data["metadata[owner_id]"] = str(owner_email)
+
+        body = f"{urlencode(data)}&{_encode_line_items(credit_pack)}"
+        response = await client.post(
+            "/checkout/sessions",
+            headers=self._get_headers(),
+            content=body.encode("ascii"),
+        )
+        response.raise_for_status()
+        session_data = response.json()
+
+        return CheckoutSession(
+            session_id=session_data["id"],
+            url=session_data["url"],
+            expires_at=datetime.fromtimestamp(session_data["expires_at"], tz=UTC),
+        )
 
     def _verify_signature(self, payload: bytes, signature: str) -> bool:
         """Verify the Stripe webhook signature."""
-        # Parse the signature header
-        elements = dict(item.split("=") for item in signature.split(","))
-        timestamp = elements.get("t")
-        v1_signature = elements.get("v1")
-
-        if not timestamp or not v1_signature:
+        # Parse the signature header; Stripe may send several v1 signatures
+        # while a webhook secret is being rolled
+        timestamp = None
+        v1_signatures = []
+        for item in signature.split(","):
+            key, _, value = item.partition("=")
+            if key == "t":
+                timestamp = value
+            elif key == "v1":
+                v1_signatures.append(value)
+
+        if not timestamp or not v1_signatures:
             return False
 
-        # Compute expected signature
-        signed_payload = f"{timestamp}.{payload.decode('utf-8')}"
-        expected_sig = hmac.new(
-            self._webhook_secret.encode("utf-8"),
-            signed_payload.encode("utf-8"),
-            hashlib.sha256,
-        ).hexdigest()
+        # Compute expected signature over the raw bytes, without decoding the body
+        mac = self._hmac_template.copy()
+        mac.update(timestamp.encode("utf-8"))
+        mac.update(b".")
+        mac.update(payload)
+        expected_sig = mac.hexdigest()
 
         # Constant time comparison
-        return hmac.compare_digest(expected_sig, v1_signature)
+        return any(hmac.compare_digest(expected_sig, sig) for sig in v1_signatures)
 
     async def verify_webhook(
         self,
@@ -124,11 +175,25 @@ class StripePaymentProvider:
 
         Returns None if the event is not a successful payment completion.
         """
-        if not self._verify_signature(payload, signature):
+        if len(payload) > LARGE_WEBHOOK_PAYLOAD_BYTES:
+            # Keep large HMAC and JSON work off the event loop
+            is_valid, event = await asyncio.gather(
+                asyncio.to_thread(self._verify_signature, payload, signature),
+                asyncio.to_thread(orjson.loads, payload),
+                return_exceptions=True,
+            )
+        else:
+            is_valid = self._verify_signature(payload, signature)
+            event = None
+
+        if is_valid is not True:
             logger.warning("Invalid webhook signature")
             return None
+        if event is None:
+            event = orjson.loads(payload)
+        elif isinstance(event, Exception):
+            raise event
 
-        event = json.loads(payload)
         event_type = event.get("type")
 
         # We only process successful checkout completions
@@ -172,33 +237,33 @@ class StripePaymentProvider:
 
         Returns the Stripe customer ID.
         """
+        client = await self._get_client()
+
         # If we already have a customer ID, verify it exists
         if billing_account.stripe_customer_id:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self._base_url}/customers/{billing_account.stripe_customer_id}",
-                    headers=self._get_headers(),
-                )
-                if response.status_code == 200:
-                    return billing_account.stripe_customer_id
-                # Customer was deleted, create a new one
-
-        # Create a new customer
-        async with httpx.AsyncClient() as client:
-            data = {
-                "email": email,
-                "metadata[billing_account_id]": str(billing_account.id),
-                "metadata[account_type]": billing_account.account_type.value,
-            }
-
-            response = await client.post(
-                f"{self._base_url}/customers",
+            response = await client.get(
+                f"/customers/{billing_account.stripe_customer_id}",
                 headers=self._get_headers(),
-                data=data,
             )
-            response.raise_for_status()
-            customer = response.json()
-            return customer["id"]
+            if response.status_code == 200:
+                return billing_account.stripe_customer_id
+            # Customer was deleted, create a new one
+
+        # Create a new customer
+        data = {
+            "email": email,
+            "metadata[billing_account_id]": str(billing_account.id),
+            "metadata[account_type]": billing_account.account_type.value,
+        }
+
+        response = await client.post(
+            "/customers",
+            headers=self._get_headers(),
+            data=data,
+        )
+        response.raise_for_status()
+        customer = response.json()
+        return customer["id"]
 
     async def refund_payment(
         self,
@@ -210,32 +275,42 @@ class StripePaymentProvider:
 
         Returns the refund ID.
         """
-        async with httpx.AsyncClient() as client:
-            data = {"payment_intent": payment_id}
-            if amount_cents is not None:
-                data["amount"] = str(amount_cents)
-
-            response = await client.post(
-                f"{self._base_url}/refunds",
-                headers=self._get_headers(),
-                data=data,
-            )
-            response.raise_for_status()
-            refund = response.json()
-            return refund["id"]
+        client = await self._get_client()
+        data = {"payment_intent": payment_id}
+        if amount_cents is not None:
+            data["amount"] = str(amount_cents)
+
+        response = await client.post(
+            "/refunds",
+            headers=self._get_headers(),
+            data=data,
+        )
+        response.raise_for_status()
+        refund = response.json()
+        return refund["id"]
 
     async def get_checkout_session(self, session_id: str) -> dict | None:
         """
         Retrieve a checkout session by ID.
 
         Useful for verification after redirect or webhook processing.
+        Results, including "not found", are cached briefly.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self._base_url}/checkout/sessions/{session_id}",
-                headers=self._get_headers(),
+        cached = self._session_cache.get(session_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        client = await self._get_client()
+        response = await client.get(
+            f"/checkout/sessions/{session_id}",
+            headers=self._get_headers(),
+        )
+        if response.status_code == 404:
+            self._session_cache.set(
+                session_id, None, ttl=MISSING_CHECKOUT_SESSION_CACHE_TTL_SECONDS
             )
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return response.json()
+            return None
+        response.raise_for_status()
+        session = orjson.loads(response.content)
+        self._session_cache.set(session_id, session)
+        return session
@@ -1,3 +1,4 @@
+from .memory import TTLCache
 from .redis import RedisCache
 
-__all__ = ["RedisCache"]
+__all__ = ["RedisCache", "TTLCache"]
@@ -0,0 +1,131 @@
+"""
+Binary encoding for cached values.
+
+Domain dataclasses are encoded as JSON via orjson, tagged with their class
+name so they can be rebuilt on read. Values orjson cannot represent fall back
+to pickle. Payloads over `COMPRESSION_THRESHOLD` bytes are zstd-compressed.
+Each payload starts with a one-byte format tag; pickle payloads written before
+the tag existed start with the pickle protocol opcode and are still readable.
+"""
+
+import pickle
+import types
+from collections.abc import Callable
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Union, get_args, get_origin, get_type_hints
+from uuid import UUID
+
+import orjson
+import zstandard
+
+from democrata_server.domain.agents import entities as agent_entities
+from democrata_server.domain.ingestion import entities as ingestion_entities
+from democrata_server.domain.rag import entities as rag_entities
+from democrata_server.domain.usage import entities as usage_entities
+
+ORJSON_TAG = b"\x01"
+PICKLE_TAG = b"\x00"
+ZSTD_TAG = b"\xfe"
+
+COMPRESSION_THRESHOLD = 1024
+COMPRESSION_LEVEL = 3
+
+_TYPE_KEY = "__t__"
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _registered_types() -> dict[str, type]:
+    """Collect the domain dataclasses that may be cached."""
+    registry: dict[str, type] = {}
+    for module in (rag_entities, agent_entities, ingestion_entities, usage_entities):
+        for value in vars(module).values():
+            if isinstance(value, type) and is_dataclass(value):
+                registry[value.__name__] = value
+    return registry
+
+
+def _field_converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """Get a converter for field types that JSON flattens to strings."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return annotation
+        if issubclass(annotation, UUID):
+            return UUID
+        if issubclass(annotation, datetime):
+            return datetime.fromisoformat
+    return None
+
+
+def _field_converters(cls: type) -> dict[str, Callable[[Any], Any]]:
+    hints = get_type_hints(cls)
+    converters = {}
+    for f in fields(cls):
+        converter = _field_converter(hints.get(f.name))
+        if converter is not None:
+            converters[f.name] = converter
+    return converters
+
+
+_TYPES = _registered_types()
+_CONVERTERS = {cls: _field_converters(cls) for cls in _TYPES.values()}
+
+# Shared across calls; the cache is only used from the event loop thread
+_compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _default(obj: Any) -> Any:
+    cls = type(obj)
+    if is_dataclass(obj) and _TYPES.get(cls.__name__) is cls:
+        data = {f.name: getattr(obj, f.name) for f in fields(obj)}
+        data[_TYPE_KEY] = cls.__name__
+        return data
+    raise TypeError(f"Type is not cacheable as JSON: {cls.__name__}")
+
+
+def _revive(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_revive(item) for item in value]
+    if isinstance(value, dict):
+        type_name = value.pop(_TYPE_KEY, None)
+        data = {key: _revive(item) for key, item in value.items()}
+        if type_name is None:
+            return data
+        cls = _TYPES[type_name]
+        for name, convert in _CONVERTERS[cls].items():
+            if data.get(name) is not None:
+                data[name] = convert(data[name])
+        return cls(**data)
+    return value
+
+
+def encode(value: Any) -> bytes:
+    """Encode a value for storage, compressing it if large."""
+    try:
+        data = ORJSON_TAG + orjson.dumps(value, default=_default, option=_OPTIONS)
+    except TypeError:
+        data = PICKLE_TAG + pickle.dumps(value)
+    if len(data) > COMPRESSION_THRESHOLD:
+        return ZSTD_TAG + _compressor.compress(data)
+    return data
+
+
+def decode(data: bytes) -> Any:
+    """Decode a stored value."""
+    tag = data[:1]
+    if tag == ZSTD_TAG:
+        data = _decompressor.decompress(data[1:])
+        tag = data[:1]
+    if tag == ORJSON_TAG:
+        return _revive(orjson.loads(data[1:]))
+    if tag == PICKLE_TAG:
+        return pickle.loads(data[1:])
+    # Untagged legacy pickle payload
+    return pickle.loads(data)
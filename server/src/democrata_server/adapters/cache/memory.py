@@ -0,0 +1,52 @@
+"""In-process TTL cache for short-lived lookups that don't warrant Redis."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Entries expire after `ttl` seconds (overridable per entry) and the least
+    recently used entry is evicted once `maxsize` is reached. Intended for
+    single event-loop use, so no locking is performed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or `default` if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a value if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,38 +1,74 @@
 import hashlib
-import pickle
 from typing import Any
 
+import orjson
 import redis.asyncio as redis
 
+from democrata_server.adapters.cache import codec
 from democrata_server.domain.rag.entities import Query
 
 
 class RedisCache:
-    def __init__(self, url: str = "redis://localhost:6379/0"):
-        self.client = redis.from_url(url, decode_responses=False)
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        max_connections: int = 64,
+        client_name: str = "democrata",
+    ):
+        self._pool = redis.ConnectionPool.from_url(
+            url,
+            decode_responses=False,
+            max_connections=max_connections,
+            client_name=client_name,
+        )
+        self.client = redis.Redis(connection_pool=self._pool)
 
     async def get(self, key: str) -> Any | None:
         data = await self.client.get(key)
         if data is None:
             return None
-        return pickle.loads(data)
+        return codec.decode(data)
 
     async def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
-        data = pickle.dumps(value)
+        data = codec.encode(value)
         if ttl_seconds:
             await self.client.setex(key, ttl_seconds, data)
         else:
             await self.client.set(key, data)
 
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        if not keys:
+            return []
+        values = await self.client.mget(keys)
+        return [None if data is None else codec.decode(data) for data in values]
+
+    async def set_many(self, items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, codec.encode(value), ex=ttl_seconds or None)
+            await pipe.execute()
+
     async def delete(self, key: str) -> None:
         await self.client.delete(key)
 
+    async def increment(self, key: str, ttl_seconds: int) -> int:
+        """Atomically increment a counter, (re)setting its TTL, and return the new count."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl_seconds)
+            count, _ = await pipe.execute()
+        return count
+
     def query_key(self, query: Query) -> str:
-        key_parts = [query.text]
-        if query.filters:
-            key_parts.append(str(query.filters))
-        key_str = "|".join(key_parts)
-        return f"rag:query:{hashlib.sha256(key_str.encode()).hexdigest()[:16]}"
+        # Sorted-key JSON gives the same bytes for equal filters regardless of field order
+        canonical = orjson.dumps(
+            {"text": query.text, "filters": query.filters},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return f"rag:q:v2:{hashlib.sha256(canonical).hexdigest()[:32]}"
 
     async def close(self) -> None:
-        await self.client.close()
+        await self.client.aclose()
+        await self._pool.disconnect()
@@ -1,6 +1,12 @@
 """Shared component parsing and system prompt for LLM clients."""
 
 import logging
+import re
+from collections.abc import Callable
+from typing import Any
+
+import fastjsonschema
+import orjson
 
 from democrata_server.domain.rag.entities import (
     Chart,
@@ -19,7 +25,6 @@ from democrata_server.domain.rag.entities import (
     PartyVote,
     TableColumn,
     TextBlock,
-    TextFormat,
     Timeline,
     TimelineEvent,
     VotingBreakdown,
@@ -28,7 +33,7 @@ from democrata_server.adapters.llm.constraints import validate_component, Constr
 
 logger = logging.getLogger(__name__)
 
-SYSTEM_PROMPT = """You are Polly, an assistant that helps people understand Australian political information.
+_PROMPT_RULES = """You are Polly, an assistant that helps people understand Australian political information.
 
 RULES:
 1. Only use information from the provided context
@@ -168,9 +173,9 @@ IMPORTANT: value must be a number, not a string
   ]
 }
 result must be: "passed", "rejected", or "tied"
-IMPORTANT: all vote counts must be numbers, not strings
+IMPORTANT: all vote counts must be numbers, not strings"""
 
-EXAMPLE COMPLETE RESPONSES:
+SYSTEM_PROMPT_EXAMPLES = """EXAMPLE COMPLETE RESPONSES:
 
 Example 1 - Parliamentary vote (mostly stack layout, grid only for chart pairing):
 {
@@ -295,9 +300,9 @@ Example 3 - Policy comparison (grid ONLY for two related charts):
       ]
     }
   ]
-}
+}"""
 
-LAYOUT GUIDELINES:
+_PROMPT_GUIDELINES = """LAYOUT GUIDELINES:
 - DEFAULT to stack layout (omit "layout" property) - this gives full-width, readable components
 - ONLY use "layout": "grid" when you have exactly 2 charts or 2 voting breakdowns that compare related data
 - Text blocks, tables, timelines, and comparisons should ALWAYS be full-width (stack layout)
@@ -315,6 +320,66 @@ CONTENT GUIDELINES:
 - Include a subtitle to summarize the key finding or answer
 - Organize into multiple focused sections rather than one large section"""
 
+# Rules, component schema and guidelines without the worked examples
+SYSTEM_PROMPT_CORE = f"{_PROMPT_RULES}\n\n{_PROMPT_GUIDELINES}"
+
+
+def build_system_prompt(include_examples: bool = True) -> str:
+    """Build the system prompt, optionally without the example responses.
+
+    The examples are roughly half the prompt. Leave them out only where the
+    model has already seen them, e.g. follow-up turns in the same conversation.
+    """
+    if not include_examples:
+        return SYSTEM_PROMPT_CORE
+    return f"{_PROMPT_RULES}\n\n{SYSTEM_PROMPT_EXAMPLES}\n\n{_PROMPT_GUIDELINES}"
+
+
+SYSTEM_PROMPT = build_system_prompt()
+
+# Serialized once so request bodies can embed it with orjson.Fragment rather
+# than re-escaping ~10 KB of prompt text per call
+SYSTEM_PROMPT_JSON = orjson.dumps(SYSTEM_PROMPT)
+
+
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+_USER_MESSAGE_PREFIX = "Context from political documents:\n\n"
+_USER_MESSAGE_QUESTION = "\n\n---\n\nUser question: "
+_USER_MESSAGE_SUFFIX = "\n\nRespond with a JSON object as specified."
+
+
+def build_user_message(query: str, context: list[str]) -> str:
+    """Build the user message asking the model to answer `query` from `context`."""
+    context_text = _CONTEXT_SEPARATOR.join(context) if context else "No context available."
+    # A single join rather than an f-string over the multi-KB context text
+    return "".join(
+        (_USER_MESSAGE_PREFIX, context_text, _USER_MESSAGE_QUESTION, query, _USER_MESSAGE_SUFFIX)
+    )
+
+
+# Body of the first markdown code fence, with or without a json tag. An
+# unclosed fence (e.g. a truncated response) runs to the end of the content.
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def extract_json(content: str) -> str:
+    """Extract JSON from an LLM response, handling markdown code blocks."""
+    if "```" not in content:
+        return content
+    return _FENCED_JSON_RE.search(content).group(1)
+
+
+# Component types the parser understands, in prompt order
+COMPONENT_TYPES = (
+    "text_block",
+    "notice",
+    "chart",
+    "timeline",
+    "data_table",
+    "comparison",
+    "member_profiles",
+    "voting_breakdown",
+)
 
 # JSON Schema for Ollama format parameter
 RESPONSE_SCHEMA = {
@@ -342,16 +407,7 @@ RESPONSE_SCHEMA = {
                             "properties": {
                                 "type": {
                                     "type": "string",
-                                    "enum": [
-                                        "text_block",
-                                        "notice",
-                                        "chart",
-                                        "timeline",
-                                        "data_table",
-                                        "comparison",
-                                        "member_profiles",
-                                        "voting_breakdown",
-                                    ],
+                                    "enum": list(COMPONENT_TYPES),
                                 },
                                 "size": {
                                     "type": ["string", "null"],
@@ -373,6 +429,21 @@ RESPONSE_SCHEMA = {
     },
 }
 
+# Serialized once for embedding in Ollama request bodies via orjson.Fragment
+RESPONSE_SCHEMA_JSON = orjson.dumps(RESPONSE_SCHEMA)
+
+# Compiled once at import; fastjsonschema generates a specialised validation
+# function, so there is no per-call schema parsing
+_RESPONSE_VALIDATOR = fastjsonschema.compile(RESPONSE_SCHEMA)
+
+
+def validate_response(payload: dict) -> None:
+    """Validate a parsed LLM response against RESPONSE_SCHEMA.
+
+    Raises fastjsonschema.JsonSchemaValueException (a ValueError) if invalid.
+    """
+    _RESPONSE_VALIDATOR(payload)
+
 
 # Type aliases for more lenient parsing
 TYPE_ALIASES = {
@@ -404,6 +475,247 @@ TYPE_ALIASES = {
     "info": "notice",
 }
 
+# Canonical types map to themselves so a single lookup resolves the common case
+# where the model emits the exact type, without normalising the string first
+TYPE_ALIASES.update({comp_type: comp_type for comp_type in COMPONENT_TYPES})
+
+_NOTICE_LEVELS = {level.value: level for level in NoticeLevel}
+_CHART_TYPES = {chart_type.value: chart_type for chart_type in ChartType}
+
+
+def _parse_text_block(data: dict, size: str | None) -> Component | None:
+    content = data["content"].strip()
+    return Component.create(
+        TextBlock(
+            content=content,
+            title=data.get("title"),  # format defaults to markdown
+        ),
+        size=size,
+    )
+
+
+def _parse_notice(data: dict, size: str | None) -> Component | None:
+    message = data["message"].strip()
+    level = _NOTICE_LEVELS.get(data.get("level", "info"), NoticeLevel.INFO)
+
+    return Component.create(
+        Notice(
+            message=message,
+            level=level,
+            title=data.get("title"),
+        ),
+        size=size,
+    )
+
+
+def _parse_chart(data: dict, size: str | None) -> Component | None:
+    chart_type = _CHART_TYPES.get(data.get("chart_type", "bar"), ChartType.BAR)
+
+    series_data = data["series"]
+    series = []
+    for s in series_data:
+        data_points = [
+            ChartDataPoint(
+                label=str(d.get("label", "")),
+                value=float(d["value"]),  # Constraints reject missing values
+                category=d.get("category"),
+            )
+            for d in s.get("data", [])
+        ]
+        if data_points:
+            series.append(
+                ChartSeries(
+                    name=s.get("name", ""),
+                    data=data_points,
+                )
+            )
+
+    return Component.create(
+        Chart(
+            chart_type=chart_type,
+            series=series,
+            title=data.get("title"),
+            x_axis_label=data.get("x_axis_label"),
+            y_axis_label=data.get("y_axis_label"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+def _parse_timeline(data: dict, size: str | None) -> Component | None:
+    events_data = data["events"]
+    events = [
+        TimelineEvent(
+            date=str(e.get("date", "")),
+            label=str(e.get("label", "")),
+            description=e.get("description"),
+            reference_url=e.get("reference_url"),
+            significance=int(e.get("significance", 3)),
+        )
+        for e in events_data
+        if e.get("date") or e.get("label")  # Must have at least date or label
+    ]
+
+    return Component.create(
+        Timeline(
+            events=events,
+            title=data.get("title"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+def _parse_data_table(data: dict, size: str | None) -> Component | None:
+    columns_data = data["columns"]
+    columns = [
+        TableColumn(
+            header=str(c.get("header", "")),
+            key=str(c.get("key", "")),
+            sortable=bool(c.get("sortable", False)),
+            align=str(c.get("align", "left")),
+        )
+        for c in columns_data
+        if c.get("header") or c.get("key")  # Must have header or key
+    ]
+
+    # JSON object keys are always strings; only cell values need coercing,
+    # and most already are strings
+    parsed_rows = [
+        {k: v if type(v) is str else str(v) for k, v in row.items()}
+        for row in data["rows"]
+        if isinstance(row, dict) and row
+    ]
+
+    return Component.create(
+        DataTable(
+            columns=columns,
+            rows=parsed_rows,
+            title=data.get("title"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+def _parse_comparison(data: dict, size: str | None) -> Component | None:
+    items_data = data["items"]
+    items = [
+        ComparisonItem(
+            name=str(i["name"]),
+            description=i.get("description"),
+        )
+        for i in items_data
+        if i.get("name")  # Must have a name
+    ]
+
+    attributes_data = data["attributes"]
+    attributes = [
+        ComparisonAttribute(
+            name=str(a["name"]),
+            values=[str(v) for v in a["values"]],
+        )
+        for a in attributes_data
+        if a.get("name") and a.get("values")  # Must have name and values
+    ]
+
+    return Component.create(
+        Comparison(
+            items=items,
+            attributes=attributes,
+            title=data.get("title"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+def _as_list(value: Any) -> list:
+    """Reuse decoded JSON arrays as-is; the raw dict is discarded after parsing."""
+    return value if type(value) is list else list(value or ())
+
+
+def _parse_member_profiles(data: dict, size: str | None) -> Component | None:
+    members_data = data["members"]
+    members = [
+        MemberProfile(
+            member_id=str(m.get("member_id", "")),
+            name=str(m["name"]),
+            party=str(m.get("party", "")),
+            constituency=m.get("constituency"),
+            roles=_as_list(m.get("roles")),
+            photo_url=m.get("photo_url"),
+            biography=m.get("biography"),
+            profile_url=m.get("profile_url"),
+        )
+        for m in members_data
+        if m.get("name")  # Must have a name
+    ]
+
+    return Component.create(
+        MemberProfiles(
+            members=members,
+            title=data.get("title"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+def _parse_voting_breakdown(data: dict, size: str | None) -> Component | None:
+    party_data = data.get("party_breakdown", [])
+    party_breakdown = [
+        PartyVote(
+            party=str(p["party"]),
+            votes_for=int(p.get("votes_for", 0)),
+            votes_against=int(p.get("votes_against", 0)),
+            abstentions=int(p.get("abstentions", 0)),
+            not_voting=int(p.get("not_voting", 0)),
+        )
+        for p in party_data
+        if p.get("party")  # Must have a party name
+    ]
+
+    total_for = int(data.get("total_for", 0))
+    total_against = int(data.get("total_against", 0))
+    total_abstentions = int(data.get("total_abstentions", 0))
+
+    if not (total_for or total_against) and party_breakdown:
+        # Constraints accept party-only breakdowns, so derive the totals
+        total_for = sum(p.votes_for for p in party_breakdown)
+        total_against = sum(p.votes_against for p in party_breakdown)
+        total_abstentions = total_abstentions or sum(p.abstentions for p in party_breakdown)
+
+    return Component.create(
+        VotingBreakdown(
+            total_for=total_for,
+            total_against=total_against,
+            party_breakdown=party_breakdown,
+            title=data.get("title"),
+            date=data.get("date"),
+            total_abstentions=total_abstentions,
+            result=data.get("result"),
+            caption=data.get("caption"),
+        ),
+        size=size,
+    )
+
+
+# Canonical component type -> parser
+_HANDLERS: dict[str, Callable[[dict, str | None], Component | None]] = {
+    "text_block": _parse_text_block,
+    "notice": _parse_notice,
+    "chart": _parse_chart,
+    "timeline": _parse_timeline,
+    "data_table": _parse_data_table,
+    "comparison": _parse_comparison,
+    "member_profiles": _parse_member_profiles,
+    "voting_breakdown": _parse_voting_breakdown,
+}
+
+assert _HANDLERS.keys() == set(COMPONENT_TYPES), "every component type needs a parser"
+
 
 def parse_component(data: dict) -> Component | None:
     """Parse a component dictionary into a domain Component object.
@@ -413,251 +725,43 @@ def parse_component(data: dict) -> Component | None:
     """
     raw_type = data.get("type", "")
     size = data.get("size")  # Extract size property
-    
-    # Normalize type: lowercase, replace hyphens with underscores
-    normalized_type = raw_type.lower().replace("-", "_").strip()
-    
-    # Apply aliases
-    comp_type = TYPE_ALIASES.get(normalized_type, normalized_type)
+
+    # Apply aliases, falling back to the normalized type (lowercase, hyphens
+    # replaced with underscores) when the raw type isn't a known spelling
+    comp_type = TYPE_ALIASES.get(raw_type)
+    if comp_type is None:
+        normalized_type = raw_type.lower().replace("-", "_").strip()
+        comp_type = TYPE_ALIASES.get(normalized_type, normalized_type)
 
     # Validate component data against constraints
     validation = validate_component(comp_type, data)
     if not validation.is_valid:
-        logger.info(
-            f"Skipping {comp_type}: {validation.reason}"
-            + (f" (suggestion: {validation.suggestion})" if validation.suggestion else "")
-        )
-        return None
-
-    if comp_type == "text_block":
-        content = data.get("content", "").strip()
-        return Component.create(
-            TextBlock(
-                content=content,
-                title=data.get("title"),
-                format=TextFormat.MARKDOWN,
-            ),
-            size=size,
-        )
-
-    elif comp_type == "notice":
-        message = data.get("message", "").strip()
-        level_str = data.get("level", "info")
-        level = NoticeLevel.INFO
-        if level_str == "warning":
-            level = NoticeLevel.WARNING
-        elif level_str == "important":
-            level = NoticeLevel.IMPORTANT
-
-        return Component.create(
-            Notice(
-                message=message,
-                level=level,
-                title=data.get("title"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "chart":
-        chart_type_str = data.get("chart_type", "bar")
-        try:
-            chart_type = ChartType(chart_type_str)
-        except ValueError:
-            chart_type = ChartType.BAR
-
-        series_data = data.get("series", [])
-        series = []
-        for s in series_data:
-            data_points = [
-                ChartDataPoint(
-                    label=str(d.get("label", "")),
-                    value=float(d.get("value", 0)),
-                    category=d.get("category"),
-                )
-                for d in s.get("data", [])
-            ]
-            if data_points:
-                series.append(
-                    ChartSeries(
-                        name=s.get("name", ""),
-                        data=data_points,
-                    )
-                )
-
-        if not series:
-            # This shouldn't happen if constraints passed, but handle gracefully
-            return None
-
-        return Component.create(
-            Chart(
-                chart_type=chart_type,
-                series=series,
-                title=data.get("title"),
-                x_axis_label=data.get("x_axis_label"),
-                y_axis_label=data.get("y_axis_label"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "timeline":
-        events_data = data.get("events", [])
-        events = [
-            TimelineEvent(
-                date=str(e.get("date", "")),
-                label=str(e.get("label", "")),
-                description=e.get("description"),
-                reference_url=e.get("reference_url"),
-                significance=int(e.get("significance", 3)),
+        # Lazy %-formatting: INFO is usually disabled, so skip building the message
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Skipping %s: %s%s",
+                comp_type,
+                validation.reason,
+                f" (suggestion: {validation.suggestion})" if validation.suggestion else "",
             )
-            for e in events_data
-            if e.get("date") or e.get("label")  # Must have at least date or label
-        ]
-
-        if not events:
-            # This shouldn't happen if constraints passed, but handle gracefully
-            return None
-
-        return Component.create(
-            Timeline(
-                events=events,
-                title=data.get("title"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "data_table":
-        columns_data = data.get("columns", [])
-        columns = [
-            TableColumn(
-                header=str(c.get("header", "")),
-                key=str(c.get("key", "")),
-                sortable=bool(c.get("sortable", False)),
-                align=str(c.get("align", "left")),
-            )
-            for c in columns_data
-            if c.get("header") or c.get("key")  # Must have header or key
-        ]
-
-        rows = data.get("rows", [])
-        parsed_rows = []
-        for row in rows:
-            if isinstance(row, dict) and row:
-                parsed_rows.append({str(k): str(v) for k, v in row.items()})
-
-        if not columns or not parsed_rows:
-            # This shouldn't happen if constraints passed, but handle gracefully
-            return None
-
-        return Component.create(
-            DataTable(
-                columns=columns,
-                rows=parsed_rows,
-                title=data.get("title"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "comparison":
-        items_data = data.get("items", [])
-        items = [
-            ComparisonItem(
-                name=str(i.get("name", "")),
-                description=i.get("description"),
-            )
-            for i in items_data
-            if i.get("name")  # Must have a name
-        ]
-
-        attributes_data = data.get("attributes", [])
-        attributes = [
-            ComparisonAttribute(
-                name=str(a.get("name", "")),
-                values=[str(v) for v in a.get("values", [])],
-            )
-            for a in attributes_data
-            if a.get("name") and a.get("values")  # Must have name and values
-        ]
-
-        if not items or not attributes:
-            # This shouldn't happen if constraints passed, but handle gracefully
-            return None
-
-        return Component.create(
-            Comparison(
-                items=items,
-                attributes=attributes,
-                title=data.get("title"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "member_profiles":
-        members_data = data.get("members", [])
-        members = [
-            MemberProfile(
-                member_id=str(m.get("member_id", "")),
-                name=str(m.get("name", "")),
-                party=str(m.get("party", "")),
-                constituency=m.get("constituency"),
-                roles=list(m.get("roles", [])),
-                photo_url=m.get("photo_url"),
-                biography=m.get("biography"),
-                profile_url=m.get("profile_url"),
-            )
-            for m in members_data
-            if m.get("name")  # Must have a name
-        ]
-
-        if not members:
-            # This shouldn't happen if constraints passed, but handle gracefully
-            return None
-
-        return Component.create(
-            MemberProfiles(
-                members=members,
-                title=data.get("title"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
-
-    elif comp_type == "voting_breakdown":
-        party_data = data.get("party_breakdown", [])
-        party_breakdown = [
-            PartyVote(
-                party=str(p.get("party", "")),
-                votes_for=int(p.get("votes_for", 0)),
-                votes_against=int(p.get("votes_against", 0)),
-                abstentions=int(p.get("abstentions", 0)),
-                not_voting=int(p.get("not_voting", 0)),
-            )
-            for p in party_data
-            if p.get("party")  # Must have a party name
-        ]
+        return None
 
-        total_for = int(data.get("total_for", 0))
-        total_against = int(data.get("total_against", 0))
-
-        return Component.create(
-            VotingBreakdown(
-                total_for=total_for,
-                total_against=total_against,
-                party_breakdown=party_breakdown,
-                title=data.get("title"),
-                date=data.get("date"),
-                total_abstentions=int(data.get("total_abstentions", 0)),
-                result=data.get("result"),
-                caption=data.get("caption"),
-            ),
-            size=size,
-        )
+    # Handlers rely on the constraints above: they index the fields those
+    # require and don't re-check data sufficiency
+    handler = _HANDLERS.get(comp_type)
+    if handler is not None:
+        return handler(data, size)
 
     # Log unrecognized types for debugging
     if raw_type:
-        logger.warning(f"Unrecognized component type: '{raw_type}' (normalized: '{comp_type}')")
+        logger.warning(
+            "Unrecognized component type: '%s' (normalized: '%s')", raw_type, comp_type
+        )
     
     return None
+
+
+def parse_components(items: list[dict]) -> list[Component]:
+    """Parse a section's component dictionaries, dropping invalid ones."""
+    parse = parse_component
+    return [component for data in items if (component := parse(data)) is not None]
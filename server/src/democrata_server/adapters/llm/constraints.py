@@ -19,7 +19,7 @@ class ConstraintViolation(str, Enum):
     POOR_FIT = "poor_fit"  # Data exists but doesn't suit this component type
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     """Result of component validation."""
 
@@ -30,7 +30,7 @@ class ValidationResult:
 
     @classmethod
     def valid(cls) -> "ValidationResult":
-        return cls(is_valid=True)
+        return _VALID
 
     @classmethod
     def invalid(
@@ -47,6 +47,48 @@ class ValidationResult:
         )
 
 
+# Valid results carry no details, so every validator shares one instance
+_VALID = ValidationResult(is_valid=True)
+
+# Rejections with fixed messages are shared too; the rest include counts
+_NO_SERIES = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Chart has no series data",
+    suggestion="text_block",
+)
+_MISSING_VALUE = ValidationResult.invalid(
+    ConstraintViolation.INVALID_STRUCTURE,
+    "Chart data point missing value",
+)
+_PIE_NEGATIVE = ValidationResult.invalid(
+    ConstraintViolation.POOR_FIT,
+    "Pie chart cannot display negative values",
+    suggestion="bar",
+)
+_NO_ATTRIBUTES = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Comparison has no attributes to compare",
+    suggestion="text_block",
+)
+_NO_VOTES = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Voting breakdown has no vote data",
+    suggestion="text_block",
+)
+_NO_MEMBERS = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Member profiles has no valid members",
+)
+_NO_TEXT = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Text block has no content",
+)
+_NO_MESSAGE = ValidationResult.invalid(
+    ConstraintViolation.INSUFFICIENT_DATA,
+    "Notice has no message",
+)
+
+
 # --- Constraint Definitions ---
 
 # Chart constraints
@@ -80,78 +122,66 @@ def validate_chart(data: dict) -> ValidationResult:
     chart_type = data.get("chart_type", "bar")
 
     if not series:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            "Chart has no series data",
-            suggestion="text_block",
-        )
+        return _NO_SERIES
 
-    # Count total data points across all series
-    total_points = sum(len(s.get("data", [])) for s in series)
+    is_pie = chart_type in ("pie", "doughnut")
+    is_line = chart_type == "line"
 
-    if total_points < CHART_MIN_DATA_POINTS:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            f"Chart has only {total_points} data point(s), minimum is {CHART_MIN_DATA_POINTS}",
-            suggestion="text_block",
-        )
+    # Single pass over the series: count points, check values, and apply
+    # the chart-type-specific constraints as each series is visited
+    total_points = 0
+    for index, s in enumerate(series):
+        points = s.get("data", [])
+        total_points += len(points)
 
-    # Check for valid numeric values
-    for s in series:
-        for point in s.get("data", []):
-            value = point.get("value")
-            if value is None:
-                return ValidationResult.invalid(
-                    ConstraintViolation.INVALID_STRUCTURE,
-                    "Chart data point missing value",
-                )
-            try:
-                float(value)
-            except (TypeError, ValueError):
-                return ValidationResult.invalid(
-                    ConstraintViolation.INVALID_STRUCTURE,
-                    f"Chart data point has non-numeric value: {value}",
-                )
-
-    # Chart-type-specific constraints
-    if chart_type in ("pie", "doughnut"):
-        # Pie charts need positive values and limited slices
-        first_series = series[0] if series else {}
-        points = first_series.get("data", [])
+        if is_line and len(points) < LINE_MIN_DATA_POINTS:
+            # Line charts need enough points to show a trend
+            return ValidationResult.invalid(
+                ConstraintViolation.POOR_FIT,
+                f"Line chart series has only {len(points)} points, minimum is {LINE_MIN_DATA_POINTS}",
+                suggestion="bar",
+            )
 
-        if len(points) > PIE_MAX_SLICES:
+        # Pie charts only render the first series
+        check_pie = is_pie and index == 0
+        if check_pie and len(points) > PIE_MAX_SLICES:
             return ValidationResult.invalid(
                 ConstraintViolation.POOR_FIT,
                 f"Pie chart has {len(points)} slices, maximum recommended is {PIE_MAX_SLICES}",
                 suggestion="bar",  # Convert to bar chart
             )
 
-        # Check for negative values in pie charts
+        # Check for valid numeric values
         for point in points:
-            if float(point.get("value", 0)) < 0:
+            value = point.get("value")
+            if value is None:
+                return _MISSING_VALUE
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
                 return ValidationResult.invalid(
-                    ConstraintViolation.POOR_FIT,
-                    "Pie chart cannot display negative values",
-                    suggestion="bar",
+                    ConstraintViolation.INVALID_STRUCTURE,
+                    f"Chart data point has non-numeric value: {value}",
                 )
+            if check_pie and number < 0:
+                return _PIE_NEGATIVE
 
-    elif chart_type == "line":
-        # Line charts need enough points to show a trend
-        for s in series:
-            if len(s.get("data", [])) < LINE_MIN_DATA_POINTS:
-                return ValidationResult.invalid(
-                    ConstraintViolation.POOR_FIT,
-                    f"Line chart series has only {len(s.get('data', []))} points, minimum is {LINE_MIN_DATA_POINTS}",
-                    suggestion="bar",
-                )
+    if total_points < CHART_MIN_DATA_POINTS:
+        return ValidationResult.invalid(
+            ConstraintViolation.INSUFFICIENT_DATA,
+            f"Chart has only {total_points} data point(s), minimum is {CHART_MIN_DATA_POINTS}",
+            suggestion="text_block",
+        )
 
     # Warn about too many data points (but still allow)
     if total_points > CHART_MAX_DATA_POINTS:
         logger.warning(
-            f"Chart has {total_points} data points, may be hard to read (max recommended: {CHART_MAX_DATA_POINTS})"
+            "Chart has %d data points, may be hard to read (max recommended: %d)",
+            total_points,
+            CHART_MAX_DATA_POINTS,
         )
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_comparison(data: dict) -> ValidationResult:
@@ -171,26 +201,30 @@ def validate_comparison(data: dict) -> ValidationResult:
         )
 
     if len(valid_attributes) < COMPARISON_MIN_ATTRIBUTES:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            f"Comparison has no attributes to compare",
-            suggestion="text_block",
-        )
+        return _NO_ATTRIBUTES
 
     if len(valid_items) > COMPARISON_MAX_ITEMS:
         logger.warning(
-            f"Comparison has {len(valid_items)} items, may be hard to read (max recommended: {COMPARISON_MAX_ITEMS})"
+            "Comparison has %d items, may be hard to read (max recommended: %d)",
+            len(valid_items),
+            COMPARISON_MAX_ITEMS,
         )
 
-    # Check that attribute values align with item count
-    for attr in valid_attributes:
-        values = attr.get("values", [])
-        if len(values) != len(valid_items):
-            logger.warning(
-                f"Comparison attribute '{attr.get('name')}' has {len(values)} values but {len(valid_items)} items"
-            )
+    # Check that attribute values align with item count. This only produces
+    # warnings, so skip the loop entirely when they wouldn't be emitted.
+    if logger.isEnabledFor(logging.WARNING):
+        item_count = len(valid_items)
+        for attr in valid_attributes:
+            values = attr.get("values", [])
+            if len(values) != item_count:
+                logger.warning(
+                    "Comparison attribute '%s' has %d values but %d items",
+                    attr.get("name"),
+                    len(values),
+                    item_count,
+                )
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_timeline(data: dict) -> ValidationResult:
@@ -207,7 +241,7 @@ def validate_timeline(data: dict) -> ValidationResult:
             suggestion="text_block",
         )
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_data_table(data: dict) -> ValidationResult:
@@ -233,38 +267,36 @@ def validate_data_table(data: dict) -> ValidationResult:
             suggestion="text_block",
         )
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_voting_breakdown(data: dict) -> ValidationResult:
     """Validate voting breakdown component data."""
-    total_for = int(data.get("total_for", 0))
-    total_against = int(data.get("total_against", 0))
+    # LLMs sometimes emit counts as strings, so values are still coerced
+    has_totals = int(data.get("total_for", 0)) > 0 or int(data.get("total_against", 0)) > 0
     party_breakdown = data.get("party_breakdown", [])
 
-    # Check if we have meaningful vote totals
-    has_totals = total_for > 0 or total_against > 0
-
-    # Check if we have meaningful party breakdown
-    has_party_votes = any(
-        int(p.get("votes_for", 0)) > 0 or int(p.get("votes_against", 0)) > 0
-        for p in party_breakdown
-        if p.get("party")
-    )
+    # Single pass: stop at the first named party once totals are known, or at
+    # the first named party with votes otherwise
+    has_valid_party = False
+    has_party_votes = False
+    for p in party_breakdown:
+        if not p.get("party"):
+            continue
+        has_valid_party = True
+        if has_totals:
+            break
+        if int(p.get("votes_for", 0)) > 0 or int(p.get("votes_against", 0)) > 0:
+            has_party_votes = True
+            break
 
     if not has_totals and not has_party_votes:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            "Voting breakdown has no vote data",
-            suggestion="text_block",
-        )
+        return _NO_VOTES
 
-    # Validate party breakdown if present
-    valid_parties = [p for p in party_breakdown if p.get("party")]
-    if party_breakdown and not valid_parties:
+    if party_breakdown and not has_valid_party:
         logger.warning("Voting breakdown has party_breakdown but no valid party entries")
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_member_profiles(data: dict) -> ValidationResult:
@@ -275,13 +307,9 @@ def validate_member_profiles(data: dict) -> ValidationResult:
     valid_members = [m for m in members if m.get("name")]
 
     if len(valid_members) < MEMBERS_MIN_COUNT:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            "Member profiles has no valid members",
-            suggestion=None,
-        )
+        return _NO_MEMBERS
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_text_block(data: dict) -> ValidationResult:
@@ -289,12 +317,9 @@ def validate_text_block(data: dict) -> ValidationResult:
     content = data.get("content", "").strip()
 
     if not content:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            "Text block has no content",
-        )
+        return _NO_TEXT
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 def validate_notice(data: dict) -> ValidationResult:
@@ -302,12 +327,9 @@ def validate_notice(data: dict) -> ValidationResult:
     message = data.get("message", "").strip()
 
     if not message:
-        return ValidationResult.invalid(
-            ConstraintViolation.INSUFFICIENT_DATA,
-            "Notice has no message",
-        )
+        return _NO_MESSAGE
 
-    return ValidationResult.valid()
+    return _VALID
 
 
 # Validator registry
@@ -338,12 +360,12 @@ def validate_component(component_type: str, data: dict) -> ValidationResult:
 
     if validator is None:
         # Unknown component type - let parse_component handle it
-        return ValidationResult.valid()
+        return _VALID
 
     try:
         return validator(data)
     except Exception as e:
-        logger.warning(f"Error validating {component_type}: {e}")
+        logger.warning("Error validating %s: %s", component_type, e)
         return ValidationResult.invalid(
             ConstraintViolation.INVALID_STRUCTURE,
             f"Validation error: {e}",
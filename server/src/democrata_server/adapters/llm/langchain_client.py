@@ -1,6 +1,6 @@
-import json
 from typing import Any
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
@@ -12,7 +12,10 @@ from democrata_server.domain.rag.entities import (
     TextFormat,
 )
 
-from .components import SYSTEM_PROMPT, parse_component
+from .components import SYSTEM_PROMPT, build_user_message, extract_json, parse_components
+
+# Messages aren't mutated when sent, so the default can be shared across calls
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
 
 
 class LangChainLLMClient:
@@ -34,20 +37,10 @@ class LangChainLLMClient:
     async def generate_response(
         self, query: str, context: list[str], system_prompt: str | None = None
     ) -> tuple[Layout, list[Component], dict[str, Any]]:
-        context_text = "\n\n---\n\n".join(context) if context else "No context available."
-
-        user_message = f"""Context from political documents:
-
-{context_text}
-
----
-
-User question: {query}
-
-Respond with a JSON object as specified."""
+        user_message = build_user_message(query, context)
 
         messages = [
-            SystemMessage(content=system_prompt or SYSTEM_PROMPT),
+            SystemMessage(content=system_prompt) if system_prompt else _SYSTEM_MESSAGE,
             HumanMessage(content=user_message),
         ]
 
@@ -66,16 +59,10 @@ Respond with a JSON object as specified."""
 
     def _parse_response(self, content: str) -> tuple[Layout, list[Component]]:
         try:
-            # Extract JSON from response (may be wrapped in markdown code blocks)
-            json_str = content
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0]
-
-            data = json.loads(json_str.strip())
+            # JSON may be wrapped in markdown code blocks
+            data = orjson.loads(extract_json(content))
             return self._build_layout_from_data(data)
-        except (json.JSONDecodeError, IndexError, KeyError):
+        except (orjson.JSONDecodeError, KeyError):
             # Fallback: wrap raw content in a text block
             return self._fallback_response(content)
 
@@ -84,12 +71,9 @@ Respond with a JSON object as specified."""
         sections: list[Section] = []
 
         for section_data in data.get("sections", []):
-            component_ids = []
-            for comp_data in section_data.get("components", []):
-                component = parse_component(comp_data)
-                if component:
-                    components.append(component)
-                    component_ids.append(component.id)
+            section_components = parse_components(section_data.get("components", []))
+            components.extend(section_components)
+            component_ids = [component.id for component in section_components]
 
             sections.append(
                 Section(
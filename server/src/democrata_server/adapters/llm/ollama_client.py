@@ -1,7 +1,8 @@
-import json
+import logging
 from typing import Any
 
 import httpx
+import orjson
 
 from democrata_server.domain.rag.entities import (
     Component,
@@ -11,7 +12,19 @@ from democrata_server.domain.rag.entities import (
     TextFormat,
 )
 
-from .components import RESPONSE_SCHEMA, SYSTEM_PROMPT, parse_component
+from .components import (
+    RESPONSE_SCHEMA_JSON,
+    SYSTEM_PROMPT_JSON,
+    build_user_message,
+    extract_json,
+    parse_components,
+    validate_response,
+)
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_MESSAGE = {"role": "system", "content": orjson.Fragment(SYSTEM_PROMPT_JSON)}
+_RESPONSE_FORMAT = orjson.Fragment(RESPONSE_SCHEMA_JSON)
 
 
 class OllamaLLMClient:
@@ -28,45 +41,63 @@ class OllamaLLMClient:
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(timeout=120.0)
+            # Long read timeout for generation, but fail fast if Ollama is down
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(120.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0
+                ),
+            )
         return self._client
 
     async def generate_response(
         self, query: str, context: list[str], system_prompt: str | None = None
     ) -> tuple[Layout, list[Component], dict[str, Any]]:
-        context_text = "\n\n---\n\n".join(context) if context else "No context available."
-
-        user_message = f"""Context from political documents:
-
-{context_text}
-
----
-
-User question: {query}
-
-Respond with a JSON object as specified."""
+        user_message = build_user_message(query, context)
 
         client = await self._get_client()
 
-        response = await client.post(
-            f"{self.base_url}/api/chat",
-            json={
+        system_message = (
+            {"role": "system", "content": system_prompt} if system_prompt else _SYSTEM_MESSAGE
+        )
+        body = orjson.dumps(
+            {
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": system_prompt or SYSTEM_PROMPT},
+                    system_message,
                     {"role": "user", "content": user_message},
                 ],
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": self.temperature,
                 },
-                "format": RESPONSE_SCHEMA,
-            },
+                "format": _RESPONSE_FORMAT,
+            }
         )
-        response.raise_for_status()
-        data = response.json()
 
-        content = data.get("message", {}).get("content", "")
+        # Streamed as NDJSON so the server doesn't buffer the whole generation;
+        # the final record carries done=true and the token counts
+        parts: list[str] = []
+        data: dict[str, Any] = {}
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/api/chat",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = orjson.loads(line)
+                message = data.get("message")
+                if message:
+                    parts.append(message.get("content", ""))
+                if data.get("done"):
+                    break
+
+        content = "".join(parts)
         # Ollama provides token counts differently
         token_usage = {
             "input_tokens": data.get("prompt_eval_count", 0),
@@ -79,15 +110,15 @@ Respond with a JSON object as specified."""
 
     def _parse_response(self, content: str) -> tuple[Layout, list[Component]]:
         try:
-            json_str = content
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0]
-
-            data = json.loads(json_str.strip())
+            # JSON may be wrapped in markdown code blocks
+            data = orjson.loads(extract_json(content))
+            try:
+                validate_response(data)
+            except ValueError as e:
+                # Parsing is lenient (type aliases etc.), so keep going
+                logger.warning(f"Response does not match schema: {e}")
             return self._build_layout_from_data(data)
-        except (json.JSONDecodeError, IndexError, KeyError):
+        except (orjson.JSONDecodeError, KeyError):
             return self._fallback_response(content)
 
     def _build_layout_from_data(self, data: dict) -> tuple[Layout, list[Component]]:
@@ -95,12 +126,9 @@ Respond with a JSON object as specified."""
         sections: list[Section] = []
 
         for section_data in data.get("sections", []):
-            component_ids = []
-            for comp_data in section_data.get("components", []):
-                component = parse_component(comp_data)
-                if component:
-                    components.append(component)
-                    component_ids.append(component.id)
+            section_components = parse_components(section_data.get("components", []))
+            components.extend(section_components)
+            component_ids = [component.id for component in section_components]
 
             sections.append(
                 Section(
@@ -7,6 +7,7 @@ from .postgres import (
     PostgresOrganizationRepository,
     PostgresTransactionRepository,
     PostgresUserRepository,
+    request_scope,
 )
 from .qdrant import QdrantVectorStore
 
@@ -20,4 +21,5 @@ __all__ = [
     "PostgresTransactionRepository",
     "PostgresUserRepository",
     "QdrantVectorStore",
+    "request_scope",
 ]
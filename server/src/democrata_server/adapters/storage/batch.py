@@ -0,0 +1,59 @@
+"""Coalesce concurrent single-key lookups into batched queries."""
+
+import asyncio
+import copy
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class BatchLoader[K: Hashable, V]:
+    """
+    Collects the keys requested during one event loop iteration and loads them
+    with a single call to load_many.
+
+    Callers await load(key) as if it were a point lookup. The first key
+    requested schedules a flush for the next loop iteration, so every lookup
+    started before then — typically by concurrent requests — shares one round
+    trip. Keys missing from load_many's result resolve to None. Each caller gets
+    its own copy of the value, since callers from unrelated requests may modify
+    what they receive.
+    """
+
+    def __init__(self, load_many: Callable[[list[K]], Awaitable[dict[K, V]]]):
+        self._load_many = load_many
+        self._pending: dict[K, asyncio.Future[V | None]] = {}
+        # Flush tasks are referenced until done so they can't be collected early
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        """Load one value, batched with any other keys requested this iteration."""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        # Shielded so one caller being cancelled doesn't cancel the shared result
+        return copy.copy(await asyncio.shield(future))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._flush(pending))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, pending: dict[K, asyncio.Future[V | None]]) -> None:
+        try:
+            values = await self._load_many(list(pending))
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(values.get(key))
@@ -1,10 +1,15 @@
 """PostgreSQL repository adapters for users, organizations, and billing."""
 
 import logging
-from datetime import UTC, datetime
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 import asyncpg
+import orjson
 
 from democrata_server.domain.auth.entities import User
 from democrata_server.domain.billing.entities import (
@@ -22,28 +27,145 @@ from democrata_server.domain.orgs.entities import (
     OrganizationPlan,
 )
 
+from .batch import BatchLoader
+
 logger = logging.getLogger(__name__)
 
+# Columns read by each repository's _row_to_* mapper. Queries select these
+# explicitly rather than with SELECT * so rows carry only what's used.
+_ORGANIZATION_COLUMNS = (
+    "id, name, slug, owner_id, billing_email, plan, max_seats, created_at, updated_at"
+)
+_MEMBERSHIP_COLUMNS = "id, user_id, organization_id, role, invited_by, joined_at"
+_INVITATION_COLUMNS = (
+    "id, email, organization_id, role, invited_by, token, status, expires_at, created_at"
+)
+_BILLING_ACCOUNT_COLUMNS = (
+    "id, account_type, user_id, organization_id, credits, lifetime_credits, lifetime_usage, "
+    "free_tier_remaining, free_tier_reset_at, stripe_customer_id, created_at, updated_at"
+)
+# Memberships joined to their organizations, with the organization's columns
+# prefixed by org_ so they don't collide with the membership's
+_MEMBERSHIP_WITH_ORG_SELECT = """
+    SELECT m.id, m.user_id, m.organization_id, m.role, m.invited_by, m.joined_at,
+           o.id AS org_id, o.name AS org_name, o.slug AS org_slug,
+           o.owner_id AS org_owner_id, o.billing_email AS org_billing_email,
+           o.plan AS org_plan, o.max_seats AS org_max_seats,
+           o.created_at AS org_created_at, o.updated_at AS org_updated_at
+    FROM public.memberships m
+    JOIN public.organizations o ON o.id = m.organization_id
+"""
+
+# Session defaults sent when each connection starts, so they cost no extra
+# round trip and survive the RESET ALL asyncpg runs when releasing a connection.
+# The repositories only run short indexed lookups, which never benefit from JIT
+# compilation. Every table is schema-qualified, but enum types and citext
+# operators are resolved through search_path. Opt-in, since PgBouncer refuses
+# startup parameters that aren't listed in its ignore_startup_parameters.
+_SERVER_SETTINGS = {
+    "jit": "off",
+    "search_path": "public, extensions",
+}
+
+# Entities already loaded during the current request, keyed by (kind, lookup
+# key). Unset outside request_scope(), in which case nothing is cached.
+_identity_map: ContextVar[dict[tuple[str, Any], Any] | None] = ContextVar(
+    "identity_map", default=None
+)
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """
+    Share looked-up users, organizations, and billing accounts within a scope.
+
+    Repeated get_by_* calls for the same key return the entity loaded by the
+    first call instead of querying again. Writes through the repositories
+    refresh the cached entity. Entered once per HTTP request by
+    RequestScopeMiddleware.
+    """
+    token = _identity_map.set({})
+    try:
+        yield
+    finally:
+        _identity_map.reset(token)
+
+
+def _recall(kind: str, key: Any) -> Any:
+    """Get an entity loaded earlier in the current request scope, if any."""
+    cache = _identity_map.get()
+    return cache.get((kind, key)) if cache is not None else None
+
+
+def _remember(kind: str, key: Any, entity: Any) -> None:
+    """Cache an entity for the rest of the current request scope."""
+    cache = _identity_map.get()
+    if cache is not None and entity is not None:
+        cache[(kind, key)] = entity
+
+
+def _forget(kind: str, key: Any) -> None:
+    """Drop a cached entity from the current request scope."""
+    cache = _identity_map.get()
+    if cache is not None:
+        cache.pop((kind, key), None)
+
 
 class PostgresConnectionPool:
     """Manages a PostgreSQL connection pool for the application."""
 
-    def __init__(self, dsn: str, min_size: int = 5, max_size: int = 20):
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int | None = None,
+        max_size: int = 50,
+        statement_cache_size: int = 1024,
+        max_inactive_connection_lifetime: float = 300.0,
+        session_settings: bool = False,
+    ):
         self._dsn = dsn
-        self._min_size = min_size
+        # Defaults to a full pool, so every connection is opened at startup
+        # rather than by the first requests of a traffic burst
+        self._min_size = max_size if min_size is None else min_size
         self._max_size = max_size
+        # Idle connections are closed and reopened on next use, replacing
+        # sockets that a proxy or firewall may have silently dropped
+        self._max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        # Must be 0 behind a transaction-mode pooler such as PgBouncer, which
+        # can't keep prepared statements across transactions
+        self._statement_cache_size = statement_cache_size
+        self._server_settings = _SERVER_SETTINGS if session_settings else None
         self._pool: asyncpg.Pool | None = None
 
     async def connect(self) -> None:
         """Initialize the connection pool."""
         if self._pool is None:
+            # The repositories use a fixed set of queries, so each connection
+            # prepares them once and keeps them rather than re-planning after
+            # asyncpg's default 300s statement lifetime
             self._pool = await asyncpg.create_pool(
                 self._dsn,
                 min_size=self._min_size,
                 max_size=self._max_size,
+                statement_cache_size=self._statement_cache_size,
+                max_cached_statement_lifetime=0,
+                max_inactive_connection_lifetime=self._max_inactive_connection_lifetime,
+                init=self._init_connection,
+                server_settings=self._server_settings,
             )
             logger.info("PostgreSQL connection pool initialized")
 
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """Decode and encode jsonb columns (e.g. transaction metadata) as Python objects."""
+        # jsonb's binary format is a version byte followed by the JSON text
+        await conn.set_type_codec(
+            "jsonb",
+            schema="pg_catalog",
+            encoder=lambda value: b"\x01" + orjson.dumps(value),
+            decoder=lambda data: orjson.loads(data[1:]),
+            format="binary",
+        )
+
     async def disconnect(self) -> None:
         """Close the connection pool."""
         if self._pool:
@@ -64,6 +186,8 @@ class PostgresUserRepository:
 
     def __init__(self, pool: PostgresConnectionPool):
         self._pool = pool
+        # Lookups by id made concurrently are answered by one query
+        self._loader: BatchLoader[UUID, User] = BatchLoader(self._fetch_by_ids)
 
     def _row_to_user(self, row: asyncpg.Record) -> User:
         """Convert a database row to a User entity."""
@@ -79,67 +203,83 @@ class PostgresUserRepository:
 
     async def get_by_id(self, user_id: UUID) -> User | None:
         """Get a user by their unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT p.id, u.email, p.name, p.avatar_url, 
-                       u.email_confirmed_at IS NOT NULL as email_verified,
-                       p.created_at, p.updated_at
-                FROM public.profiles p
-                JOIN auth.users u ON p.id = u.id
-                WHERE p.id = $1
-                """,
-                user_id,
-            )
-            return self._row_to_user(row) if row else None
+        if (user := _recall("user", user_id)) is not None:
+            return user
+        user = await self._loader.load(user_id)
+        _remember("user", user_id, user)
+        return user
+
+    async def get_by_ids(self, user_ids: list[UUID]) -> dict[UUID, User]:
+        """Get several users in one query, keyed by id. Missing ids are omitted."""
+        users = {user_id: user for user_id in user_ids if (user := _recall("user", user_id))}
+        missing = [user_id for user_id in user_ids if user_id not in users]
+        if missing:
+            for user in (await self._fetch_by_ids(missing)).values():
+                _remember("user", user.id, user)
+                users[user.id] = user
+        return users
+
+    async def _fetch_by_ids(self, user_ids: list[UUID]) -> dict[UUID, User]:
+        rows = await self._pool.pool.fetch(
+            """
+            SELECT p.id, u.email, p.name, p.avatar_url,
+                   u.email_confirmed_at IS NOT NULL as email_verified,
+                   p.created_at, p.updated_at
+            FROM public.profiles p
+            JOIN auth.users u ON p.id = u.id
+            WHERE p.id = ANY($1::uuid[])
+            """,
+            user_ids,
+        )
+        return {row["id"]: self._row_to_user(row) for row in rows}
 
     async def get_by_email(self, email: str) -> User | None:
         """Get a user by their email address."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT p.id, u.email, p.name, p.avatar_url,
-                       u.email_confirmed_at IS NOT NULL as email_verified,
-                       p.created_at, p.updated_at
-                FROM public.profiles p
-                JOIN auth.users u ON p.id = u.id
-                WHERE u.email = $1
-                """,
-                email.lower(),
-            )
-            return self._row_to_user(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            """
+            SELECT p.id, u.email, p.name, p.avatar_url,
+                   u.email_confirmed_at IS NOT NULL as email_verified,
+                   p.created_at, p.updated_at
+            FROM public.profiles p
+            JOIN auth.users u ON p.id = u.id
+            WHERE u.email = $1
+            """,
+            email.lower(),
+        )
+        return self._row_to_user(row) if row else None
 
     async def create(self, user: User) -> User:
         """Create a new user profile."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.profiles (id, name, avatar_url, created_at, updated_at)
-                VALUES ($1, $2, $3, $4, $5)
-                """,
-                user.id,
-                user.name,
-                user.avatar_url,
-                user.created_at,
-                user.updated_at,
-            )
-            return user
+        await self._pool.pool.execute(
+            """
+            INSERT INTO public.profiles (id, name, avatar_url, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5)
+            """,
+            user.id,
+            user.name,
+            user.avatar_url,
+            user.created_at,
+            user.updated_at,
+        )
+        _remember("user", user.id, user)
+        return user
 
     async def update(self, user: User) -> User:
         """Update an existing user profile."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                UPDATE public.profiles
-                SET name = $2, avatar_url = $3, updated_at = $4
-                WHERE id = $1
-                """,
-                user.id,
-                user.name,
-                user.avatar_url,
-                datetime.now(UTC),
-            )
-            return user
+        updated_at = await self._pool.pool.fetchval(
+            """
+            UPDATE public.profiles
+            SET name = $2, avatar_url = $3, updated_at = now()
+            WHERE id = $1
+            RETURNING updated_at
+            """,
+            user.id,
+            user.name,
+            user.avatar_url,
+        )
+        user.updated_at = updated_at or user.updated_at
+        _remember("user", user.id, user)
+        return user
 
 
 class PostgresOrganizationRepository:
@@ -147,6 +287,8 @@ class PostgresOrganizationRepository:
 
     def __init__(self, pool: PostgresConnectionPool):
         self._pool = pool
+        # Lookups by id made concurrently are answered by one query
+        self._loader: BatchLoader[UUID, Organization] = BatchLoader(self._fetch_by_ids)
 
     def _row_to_organization(self, row: asyncpg.Record) -> Organization:
         """Convert a database row to an Organization entity."""
@@ -164,78 +306,97 @@ class PostgresOrganizationRepository:
 
     async def get_by_id(self, org_id: UUID) -> Organization | None:
         """Get an organization by its unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.organizations WHERE id = $1",
-                org_id,
-            )
-            return self._row_to_organization(row) if row else None
+        if (organization := _recall("organization", org_id)) is not None:
+            return organization
+        organization = await self._loader.load(org_id)
+        _remember("organization", org_id, organization)
+        return organization
+
+    async def get_by_ids(self, org_ids: list[UUID]) -> dict[UUID, Organization]:
+        """Get several organizations in one query, keyed by id. Missing ids are omitted."""
+        organizations = {
+            org_id: organization
+            for org_id in org_ids
+            if (organization := _recall("organization", org_id))
+        }
+        missing = [org_id for org_id in org_ids if org_id not in organizations]
+        if missing:
+            for organization in (await self._fetch_by_ids(missing)).values():
+                _remember("organization", organization.id, organization)
+                organizations[organization.id] = organization
+        return organizations
+
+    async def _fetch_by_ids(self, org_ids: list[UUID]) -> dict[UUID, Organization]:
+        rows = await self._pool.pool.fetch(
+            f"SELECT {_ORGANIZATION_COLUMNS} FROM public.organizations "
+            "WHERE id = ANY($1::uuid[])",
+            org_ids,
+        )
+        return {row["id"]: self._row_to_organization(row) for row in rows}
 
     async def get_by_slug(self, slug: str) -> Organization | None:
         """Get an organization by its URL-friendly slug."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.organizations WHERE slug = $1",
-                slug.lower(),
-            )
-            return self._row_to_organization(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_ORGANIZATION_COLUMNS} FROM public.organizations WHERE slug = $1",
+            slug,
+        )
+        return self._row_to_organization(row) if row else None
 
     async def create(self, organization: Organization) -> Organization:
         """Create a new organization."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.organizations 
-                (id, name, slug, owner_id, billing_email, plan, max_seats, created_at, updated_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """,
-                organization.id,
-                organization.name,
-                organization.slug.lower(),
-                organization.owner_id,
-                organization.billing_email,
-                organization.plan.value,
-                organization.max_seats,
-                organization.created_at,
-                organization.updated_at,
-            )
-            return organization
+        await self._pool.pool.execute(
+            """
+            INSERT INTO public.organizations 
+            (id, name, slug, owner_id, billing_email, plan, max_seats, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            """,
+            organization.id,
+            organization.name,
+            organization.slug.lower(),
+            organization.owner_id,
+            organization.billing_email,
+            organization.plan.value,
+            organization.max_seats,
+            organization.created_at,
+            organization.updated_at,
+        )
+        _remember("organization", organization.id, organization)
+        return organization
 
     async def update(self, organization: Organization) -> Organization:
         """Update an existing organization."""
-        async with self._pool.pool.acquire() as conn:
-            organization.updated_at = datetime.now(UTC)
-            await conn.execute(
-                """
-                UPDATE public.organizations
-                SET name = $2, billing_email = $3, plan = $4, max_seats = $5, updated_at = $6
-                WHERE id = $1
-                """,
-                organization.id,
-                organization.name,
-                organization.billing_email,
-                organization.plan.value,
-                organization.max_seats,
-                organization.updated_at,
-            )
-            return organization
+        updated_at = await self._pool.pool.fetchval(
+            """
+            UPDATE public.organizations
+            SET name = $2, billing_email = $3, plan = $4, max_seats = $5, updated_at = now()
+            WHERE id = $1
+            RETURNING updated_at
+            """,
+            organization.id,
+            organization.name,
+            organization.billing_email,
+            organization.plan.value,
+            organization.max_seats,
+        )
+        organization.updated_at = updated_at or organization.updated_at
+        _remember("organization", organization.id, organization)
+        return organization
 
     async def delete(self, org_id: UUID) -> None:
         """Delete an organization and all associated data."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                "DELETE FROM public.organizations WHERE id = $1",
-                org_id,
-            )
+        await self._pool.pool.execute(
+            "DELETE FROM public.organizations WHERE id = $1",
+            org_id,
+        )
+        _forget("organization", org_id)
 
     async def slug_exists(self, slug: str) -> bool:
         """Check if a slug is already in use."""
-        async with self._pool.pool.acquire() as conn:
-            result = await conn.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM public.organizations WHERE slug = $1)",
-                slug.lower(),
-            )
-            return result
+        result = await self._pool.pool.fetchval(
+            "SELECT EXISTS(SELECT 1 FROM public.organizations WHERE slug = $1)",
+            slug,
+        )
+        return result
 
 
 class PostgresMembershipRepository:
@@ -257,88 +418,119 @@ class PostgresMembershipRepository:
 
     async def get_by_id(self, membership_id: UUID) -> Membership | None:
         """Get a membership by its unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.memberships WHERE id = $1",
-                membership_id,
-            )
-            return self._row_to_membership(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_MEMBERSHIP_COLUMNS} FROM public.memberships WHERE id = $1",
+            membership_id,
+        )
+        return self._row_to_membership(row) if row else None
 
     async def get_user_memberships(self, user_id: UUID) -> list[Membership]:
         """Get all memberships for a user."""
-        async with self._pool.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM public.memberships WHERE user_id = $1 ORDER BY joined_at",
-                user_id,
-            )
-            return [self._row_to_membership(row) for row in rows]
+        rows = await self._pool.pool.fetch(
+            f"SELECT {_MEMBERSHIP_COLUMNS} FROM public.memberships "
+            "WHERE user_id = $1 ORDER BY joined_at",
+            user_id,
+        )
+        return [self._row_to_membership(row) for row in rows]
+
+    def _row_to_organization(self, row: asyncpg.Record) -> Organization:
+        """Convert the org_-prefixed columns of a joined row to an Organization entity."""
+        return Organization(
+            id=row["org_id"],
+            name=row["org_name"],
+            slug=row["org_slug"],
+            owner_id=row["org_owner_id"],
+            billing_email=row["org_billing_email"],
+            plan=OrganizationPlan(row["org_plan"]),
+            max_seats=row["org_max_seats"],
+            created_at=row["org_created_at"],
+            updated_at=row["org_updated_at"],
+        )
+
+    async def get_user_memberships_with_orgs(
+        self, user_id: UUID
+    ) -> list[tuple[Membership, Organization]]:
+        """Get all memberships for a user along with their organizations."""
+        rows = await self._pool.pool.fetch(
+            f"{_MEMBERSHIP_WITH_ORG_SELECT} WHERE m.user_id = $1 ORDER BY m.joined_at",
+            user_id,
+        )
+        return [(self._row_to_membership(row), self._row_to_organization(row)) for row in rows]
+
+    async def get_membership_with_org(
+        self, user_id: UUID, org_id: UUID
+    ) -> tuple[Membership, Organization] | None:
+        """Get a user's membership in an organization along with the organization."""
+        row = await self._pool.pool.fetchrow(
+            f"{_MEMBERSHIP_WITH_ORG_SELECT} WHERE m.user_id = $1 AND m.organization_id = $2",
+            user_id,
+            org_id,
+        )
+        if row is None:
+            return None
+        return self._row_to_membership(row), self._row_to_organization(row)
 
     async def get_organization_members(self, org_id: UUID) -> list[Membership]:
         """Get all memberships in an organization."""
-        async with self._pool.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM public.memberships WHERE organization_id = $1 ORDER BY joined_at",
-                org_id,
-            )
-            return [self._row_to_membership(row) for row in rows]
+        rows = await self._pool.pool.fetch(
+            f"SELECT {_MEMBERSHIP_COLUMNS} FROM public.memberships "
+            "WHERE organization_id = $1 ORDER BY joined_at",
+            org_id,
+        )
+        return [self._row_to_membership(row) for row in rows]
 
     async def get_membership(self, user_id: UUID, org_id: UUID) -> Membership | None:
         """Get a specific user's membership in an organization."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT * FROM public.memberships 
-                WHERE user_id = $1 AND organization_id = $2
-                """,
-                user_id,
-                org_id,
-            )
-            return self._row_to_membership(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"""
+            SELECT {_MEMBERSHIP_COLUMNS} FROM public.memberships 
+            WHERE user_id = $1 AND organization_id = $2
+            """,
+            user_id,
+            org_id,
+        )
+        return self._row_to_membership(row) if row else None
 
     async def create(self, membership: Membership) -> Membership:
         """Create a new membership."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.memberships 
-                (id, user_id, organization_id, role, invited_by, joined_at)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                """,
-                membership.id,
-                membership.user_id,
-                membership.organization_id,
-                membership.role.value,
-                membership.invited_by,
-                membership.joined_at,
-            )
-            return membership
+        await self._pool.pool.execute(
+            """
+            INSERT INTO public.memberships 
+            (id, user_id, organization_id, role, invited_by, joined_at)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            """,
+            membership.id,
+            membership.user_id,
+            membership.organization_id,
+            membership.role.value,
+            membership.invited_by,
+            membership.joined_at,
+        )
+        return membership
 
     async def update(self, membership: Membership) -> Membership:
         """Update an existing membership (e.g., change role)."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE public.memberships SET role = $2 WHERE id = $1",
-                membership.id,
-                membership.role.value,
-            )
-            return membership
+        await self._pool.pool.execute(
+            "UPDATE public.memberships SET role = $2 WHERE id = $1",
+            membership.id,
+            membership.role.value,
+        )
+        return membership
 
     async def delete(self, membership_id: UUID) -> None:
         """Remove a membership."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                "DELETE FROM public.memberships WHERE id = $1",
-                membership_id,
-            )
+        await self._pool.pool.execute(
+            "DELETE FROM public.memberships WHERE id = $1",
+            membership_id,
+        )
 
     async def count_members(self, org_id: UUID) -> int:
         """Count the number of members in an organization."""
-        async with self._pool.pool.acquire() as conn:
-            count = await conn.fetchval(
-                "SELECT COUNT(*) FROM public.memberships WHERE organization_id = $1",
-                org_id,
-            )
-            return count or 0
+        count = await self._pool.pool.fetchval(
+            "SELECT COUNT(*) FROM public.memberships WHERE organization_id = $1",
+            org_id,
+        )
+        return count or 0
 
 
 class PostgresInvitationRepository:
@@ -363,115 +555,98 @@ class PostgresInvitationRepository:
 
     async def get_by_id(self, invitation_id: UUID) -> Invitation | None:
         """Get an invitation by its unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.invitations WHERE id = $1",
-                invitation_id,
-            )
-            return self._row_to_invitation(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_INVITATION_COLUMNS} FROM public.invitations WHERE id = $1",
+            invitation_id,
+        )
+        return self._row_to_invitation(row) if row else None
 
     async def get_by_token(self, token: str) -> Invitation | None:
         """Get an invitation by its unique token."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.invitations WHERE token = $1",
-                token,
-            )
-            return self._row_to_invitation(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_INVITATION_COLUMNS} FROM public.invitations WHERE token = $1",
+            token,
+        )
+        return self._row_to_invitation(row) if row else None
 
     async def get_pending_for_email(self, email: str) -> list[Invitation]:
         """Get all pending invitations for an email address."""
-        async with self._pool.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM public.invitations 
-                WHERE email = $1 AND status = 'pending' AND expires_at > NOW()
-                ORDER BY created_at DESC
-                """,
-                email.lower(),
-            )
-            return [self._row_to_invitation(row) for row in rows]
+        rows = await self._pool.pool.fetch(
+            f"""
+            SELECT {_INVITATION_COLUMNS} FROM public.invitations 
+            WHERE email = $1 AND status = 'pending' AND expires_at > NOW()
+            ORDER BY created_at DESC
+            """,
+            email,
+        )
+        return [self._row_to_invitation(row) for row in rows]
 
     async def get_organization_invitations(
         self, org_id: UUID, status: InvitationStatus | None = None
     ) -> list[Invitation]:
         """Get all invitations for an organization, optionally filtered by status."""
-        async with self._pool.pool.acquire() as conn:
-            if status:
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM public.invitations 
-                    WHERE organization_id = $1 AND status = $2
-                    ORDER BY created_at DESC
-                    """,
-                    org_id,
-                    status.value,
-                )
-            else:
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM public.invitations 
-                    WHERE organization_id = $1
-                    ORDER BY created_at DESC
-                    """,
-                    org_id,
-                )
-            return [self._row_to_invitation(row) for row in rows]
+        rows = await self._pool.pool.fetch(
+            f"""
+            SELECT {_INVITATION_COLUMNS} FROM public.invitations
+            WHERE organization_id = $1
+            AND ($2::invitation_status IS NULL OR status = $2)
+            ORDER BY created_at DESC
+            """,
+            org_id,
+            status.value if status else None,
+        )
+        return [self._row_to_invitation(row) for row in rows]
 
     async def create(self, invitation: Invitation) -> Invitation:
         """Create a new invitation."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.invitations 
-                (id, email, organization_id, role, invited_by, token, status, expires_at, created_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """,
-                invitation.id,
-                invitation.email.lower(),
-                invitation.organization_id,
-                invitation.role.value,
-                invitation.invited_by,
-                invitation.token,
-                invitation.status.value,
-                invitation.expires_at,
-                invitation.created_at,
-            )
-            return invitation
+        await self._pool.pool.execute(
+            """
+            INSERT INTO public.invitations 
+            (id, email, organization_id, role, invited_by, token, status, expires_at, created_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            """,
+            invitation.id,
+            invitation.email.lower(),
+            invitation.organization_id,
+            invitation.role.value,
+            invitation.invited_by,
+            invitation.token,
+            invitation.status.value,
+            invitation.expires_at,
+            invitation.created_at,
+        )
+        return invitation
 
     async def update(self, invitation: Invitation) -> Invitation:
         """Update an invitation (e.g., change status)."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE public.invitations SET status = $2 WHERE id = $1",
-                invitation.id,
-                invitation.status.value,
-            )
-            return invitation
+        await self._pool.pool.execute(
+            "UPDATE public.invitations SET status = $2 WHERE id = $1",
+            invitation.id,
+            invitation.status.value,
+        )
+        return invitation
 
     async def delete(self, invitation_id: UUID) -> None:
         """Delete an invitation."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                "DELETE FROM public.invitations WHERE id = $1",
-                invitation_id,
-            )
+        await self._pool.pool.execute(
+            "DELETE FROM public.invitations WHERE id = $1",
+            invitation_id,
+        )
 
     async def exists_for_email_and_org(self, email: str, org_id: UUID) -> bool:
         """Check if a pending invitation already exists for this email and org."""
-        async with self._pool.pool.acquire() as conn:
-            result = await conn.fetchval(
-                """
-                SELECT EXISTS(
-                    SELECT 1 FROM public.invitations 
-                    WHERE email = $1 AND organization_id = $2 
-                    AND status = 'pending' AND expires_at > NOW()
-                )
-                """,
-                email.lower(),
-                org_id,
+        result = await self._pool.pool.fetchval(
+            """
+            SELECT EXISTS(
+                SELECT 1 FROM public.invitations 
+                WHERE email = $1 AND organization_id = $2 
+                AND status = 'pending' AND expires_at > NOW()
             )
-            return result
+            """,
+            email,
+            org_id,
+        )
+        return result
 
 
 class PostgresBillingAccountRepository:
@@ -479,6 +654,8 @@ class PostgresBillingAccountRepository:
 
     def __init__(self, pool: PostgresConnectionPool):
         self._pool = pool
+        # Lookups by id made concurrently are answered by one query
+        self._loader: BatchLoader[UUID, BillingAccount] = BatchLoader(self._fetch_by_ids)
 
     def _row_to_billing_account(self, row: asyncpg.Record) -> BillingAccount:
         """Convert a database row to a BillingAccount entity."""
@@ -497,92 +674,199 @@ class PostgresBillingAccountRepository:
             updated_at=row["updated_at"],
         )
 
+    def _remember_account(self, account: BillingAccount | None) -> BillingAccount | None:
+        """Cache an account under each key it can be looked up by."""
+        if account is not None:
+            _remember("billing_account", account.id, account)
+            if account.user_id is not None:
+                _remember("billing_account_user", account.user_id, account)
+            if account.organization_id is not None:
+                _remember("billing_account_org", account.organization_id, account)
+        return account
+
     async def get_by_id(self, account_id: UUID) -> BillingAccount | None:
         """Get a billing account by its unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.billing_accounts WHERE id = $1",
-                account_id,
-            )
-            return self._row_to_billing_account(row) if row else None
+        if (account := _recall("billing_account", account_id)) is not None:
+            return account
+        return self._remember_account(await self._loader.load(account_id))
+
+    async def get_by_ids(self, account_ids: list[UUID]) -> dict[UUID, BillingAccount]:
+        """Get several billing accounts in one query, keyed by id. Missing ids are omitted."""
+        accounts = {
+            account_id: account
+            for account_id in account_ids
+            if (account := _recall("billing_account", account_id))
+        }
+        missing = [account_id for account_id in account_ids if account_id not in accounts]
+        if missing:
+            for account in (await self._fetch_by_ids(missing)).values():
+                accounts[account.id] = self._remember_account(account)
+        return accounts
+
+    async def _fetch_by_ids(self, account_ids: list[UUID]) -> dict[UUID, BillingAccount]:
+        rows = await self._pool.pool.fetch(
+            f"SELECT {_BILLING_ACCOUNT_COLUMNS} FROM public.billing_accounts "
+            "WHERE id = ANY($1::uuid[])",
+            account_ids,
+        )
+        return {row["id"]: self._row_to_billing_account(row) for row in rows}
 
     async def get_by_user_id(self, user_id: UUID) -> BillingAccount | None:
         """Get the billing account for a user."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.billing_accounts WHERE user_id = $1",
-                user_id,
-            )
-            return self._row_to_billing_account(row) if row else None
+        if (account := _recall("billing_account_user", user_id)) is not None:
+            return account
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_BILLING_ACCOUNT_COLUMNS} FROM public.billing_accounts WHERE user_id = $1",
+            user_id,
+        )
+        return self._remember_account(self._row_to_billing_account(row) if row else None)
 
     async def get_by_organization_id(self, org_id: UUID) -> BillingAccount | None:
         """Get the billing account for an organization."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.billing_accounts WHERE organization_id = $1",
-                org_id,
-            )
-            return self._row_to_billing_account(row) if row else None
+        if (account := _recall("billing_account_org", org_id)) is not None:
+            return account
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_BILLING_ACCOUNT_COLUMNS} FROM public.billing_accounts "
+            "WHERE organization_id = $1",
+            org_id,
+        )
+        return self._remember_account(self._row_to_billing_account(row) if row else None)
 
     async def create(self, account: BillingAccount) -> BillingAccount:
         """Create a new billing account."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.billing_accounts 
-                (id, account_type, user_id, organization_id, credits, lifetime_credits,
-                 lifetime_usage, free_tier_remaining, free_tier_reset_at, 
-                 stripe_customer_id, created_at, updated_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                """,
-                account.id,
-                account.account_type.value,
-                account.user_id,
-                account.organization_id,
-                account.credits,
-                account.lifetime_credits,
-                account.lifetime_usage,
-                account.free_tier_remaining,
-                account.free_tier_reset_at,
-                account.stripe_customer_id,
-                account.created_at,
-                account.updated_at,
-            )
-            return account
+        await self._pool.pool.execute(
+            """
+            INSERT INTO public.billing_accounts 
+            (id, account_type, user_id, organization_id, credits, lifetime_credits,
+             lifetime_usage, free_tier_remaining, free_tier_reset_at, 
+             stripe_customer_id, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+            """,
+            account.id,
+            account.account_type.value,
+            account.user_id,
+            account.organization_id,
+            account.credits,
+            account.lifetime_credits,
+            account.lifetime_usage,
+            account.free_tier_remaining,
+            account.free_tier_reset_at,
+            account.stripe_customer_id,
+            account.created_at,
+            account.updated_at,
+        )
+        self._remember_account(account)
+        return account
 
     async def update(self, account: BillingAccount) -> BillingAccount:
         """Update an existing billing account."""
-        account.updated_at = datetime.now(UTC)
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                UPDATE public.billing_accounts
-                SET credits = $2, lifetime_credits = $3, lifetime_usage = $4,
-                    free_tier_remaining = $5, free_tier_reset_at = $6,
-                    stripe_customer_id = $7, updated_at = $8
-                WHERE id = $1
-                """,
-                account.id,
-                account.credits,
-                account.lifetime_credits,
-                account.lifetime_usage,
-                account.free_tier_remaining,
-                account.free_tier_reset_at,
-                account.stripe_customer_id,
-                account.updated_at,
-            )
-            return account
+        updated_at = await self._pool.pool.fetchval(
+            """
+            UPDATE public.billing_accounts
+            SET credits = $2, lifetime_credits = $3, lifetime_usage = $4,
+                free_tier_remaining = $5, free_tier_reset_at = $6,
+                stripe_customer_id = $7, updated_at = now()
+            WHERE id = $1
+            RETURNING updated_at
+            """,
+            account.id,
+            account.credits,
+            account.lifetime_credits,
+            account.lifetime_usage,
+            account.free_tier_remaining,
+            account.free_tier_reset_at,
+            account.stripe_customer_id,
+        )
+        account.updated_at = updated_at or account.updated_at
+        self._remember_account(account)
+        return account
 
     async def get_by_stripe_customer_id(
         self, stripe_customer_id: str
     ) -> BillingAccount | None:
         """Get a billing account by its Stripe customer ID."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.billing_accounts WHERE stripe_customer_id = $1",
-                stripe_customer_id,
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_BILLING_ACCOUNT_COLUMNS} FROM public.billing_accounts "
+            "WHERE stripe_customer_id = $1",
+            stripe_customer_id,
+        )
+        return self._row_to_billing_account(row) if row else None
+
+    async def apply_transaction(
+        self, transaction: CreditTransaction, stripe_customer_id: str | None = None
+    ) -> BillingAccount | None:
+        """
+        Apply a transaction's amount to its account and record it, atomically.
+
+        The balance is updated and the transaction inserted by one statement, so
+        concurrent changes can't be lost between reading and writing the balance.
+        The transaction's balance_after is set from the updated balance. A given
+        stripe_customer_id is stored only if the account has none yet. Returns
+        the updated account, or None if it doesn't exist.
+        """
+        row = await self._pool.pool.fetchrow(
+            f"""
+            WITH account AS (
+                UPDATE public.billing_accounts
+                SET credits = credits + $2,
+                    lifetime_credits = lifetime_credits + GREATEST($2, 0),
+                    lifetime_usage = lifetime_usage + GREATEST(-$2, 0),
+                    stripe_customer_id = COALESCE(stripe_customer_id, $9),
+                    updated_at = now()
+                WHERE id = $1
+                RETURNING {_BILLING_ACCOUNT_COLUMNS}
+            ), recorded AS (
+                INSERT INTO public.credit_transactions
+                (id, billing_account_id, amount, transaction_type, balance_after,
+                 reference_id, description, metadata, created_at)
+                SELECT $3::uuid, id, $2, $4::transaction_type, credits,
+                       $5::text, $6::text, $7::jsonb, $8::timestamptz
+                FROM account
             )
-            return self._row_to_billing_account(row) if row else None
+            SELECT * FROM account
+            """,
+            transaction.billing_account_id,
+            transaction.amount,
+            transaction.id,
+            transaction.transaction_type.value,
+            transaction.reference_id,
+            transaction.description,
+            transaction.metadata,
+            transaction.created_at,
+            stripe_customer_id,
+        )
+        if row is None:
+            return None
+        account = self._row_to_billing_account(row)
+        transaction.balance_after = account.credits
+        self._remember_account(account)
+        return account
+
+
+# Batches at least this large are written with COPY rather than executemany
+TRANSACTION_COPY_THRESHOLD = 100
+
+_TRANSACTION_COLUMNS = [
+    "id",
+    "billing_account_id",
+    "amount",
+    "transaction_type",
+    "balance_after",
+    "reference_id",
+    "description",
+    "metadata",
+    "created_at",
+]
+_TRANSACTION_SELECT = ", ".join(_TRANSACTION_COLUMNS)
+_DATE_RANGE_SQL = f"""
+    SELECT {_TRANSACTION_SELECT} FROM public.credit_transactions
+    WHERE billing_account_id = $1 AND created_at >= $2 AND created_at <= $3
+    ORDER BY created_at DESC
+"""
+_INSERT_TRANSACTION_SQL = f"""
+    INSERT INTO public.credit_transactions ({", ".join(_TRANSACTION_COLUMNS)})
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
 
 
 class PostgresTransactionRepository:
@@ -607,12 +891,11 @@ class PostgresTransactionRepository:
 
     async def get_by_id(self, transaction_id: UUID) -> CreditTransaction | None:
         """Get a transaction by its unique identifier."""
-        async with self._pool.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM public.credit_transactions WHERE id = $1",
-                transaction_id,
-            )
-            return self._row_to_transaction(row) if row else None
+        row = await self._pool.pool.fetchrow(
+            f"SELECT {_TRANSACTION_SELECT} FROM public.credit_transactions WHERE id = $1",
+            transaction_id,
+        )
+        return self._row_to_transaction(row) if row else None
 
     async def get_by_billing_account(
         self,
@@ -620,35 +903,39 @@ class PostgresTransactionRepository:
         limit: int = 50,
         offset: int = 0,
         transaction_type: TransactionType | None = None,
+        before_id: UUID | None = None,
     ) -> list[CreditTransaction]:
-        """Get transactions for a billing account with pagination."""
-        async with self._pool.pool.acquire() as conn:
-            if transaction_type:
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM public.credit_transactions 
-                    WHERE billing_account_id = $1 AND transaction_type = $2
-                    ORDER BY created_at DESC
-                    LIMIT $3 OFFSET $4
-                    """,
-                    billing_account_id,
-                    transaction_type.value,
-                    limit,
-                    offset,
-                )
-            else:
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM public.credit_transactions 
-                    WHERE billing_account_id = $1
-                    ORDER BY created_at DESC
-                    LIMIT $2 OFFSET $3
-                    """,
-                    billing_account_id,
-                    limit,
-                    offset,
-                )
-            return [self._row_to_transaction(row) for row in rows]
+        """
+        Get transactions for a billing account with pagination, newest first.
+
+        Pass the id of the last transaction on the previous page as `before_id`
+        to fetch the next page by keyset, which seeks straight to it in the
+        (billing_account_id, created_at, id) index instead of scanning past
+        `offset` rows.
+        """
+        conditions = ["billing_account_id = $1"]
+        args: list = [billing_account_id]
+        if transaction_type:
+            args.append(transaction_type.value)
+            conditions.append(f"transaction_type = ${len(args)}")
+        if before_id:
+            args.append(before_id)
+            conditions.append(
+                f"(created_at, id) < (SELECT created_at, id FROM public.credit_transactions "
+                f"WHERE id = ${len(args)})"
+            )
+        args += (limit, offset)
+
+        rows = await self._pool.pool.fetch(
+            f"""
+            SELECT {_TRANSACTION_SELECT} FROM public.credit_transactions
+            WHERE {" AND ".join(conditions)}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ${len(args) - 1} OFFSET ${len(args)}
+            """,
+            *args,
+        )
+        return [self._row_to_transaction(row) for row in rows]
 
     async def get_by_date_range(
         self,
@@ -657,40 +944,66 @@ class PostgresTransactionRepository:
         end_date: datetime,
     ) -> list[CreditTransaction]:
         """Get transactions within a date range."""
-        async with self._pool.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM public.credit_transactions 
-                WHERE billing_account_id = $1 AND created_at >= $2 AND created_at <= $3
-                ORDER BY created_at DESC
-                """,
-                billing_account_id,
-                start_date,
-                end_date,
-            )
-            return [self._row_to_transaction(row) for row in rows]
+        rows = await self._pool.pool.fetch(
+            _DATE_RANGE_SQL, billing_account_id, start_date, end_date
+        )
+        return [self._row_to_transaction(row) for row in rows]
+
+    async def iter_by_date_range(
+        self,
+        billing_account_id: UUID,
+        start_date: datetime,
+        end_date: datetime,
+        prefetch: int = 500,
+    ) -> AsyncIterator[CreditTransaction]:
+        """
+        Stream transactions within a date range, newest first.
+
+        Rows are fetched `prefetch` at a time through a server-side cursor, so
+        memory stays bounded for long ranges such as exports. The connection is
+        held until iteration finishes.
+        """
+        async with self._pool.pool.acquire() as conn, conn.transaction():
+            async for row in conn.cursor(
+                _DATE_RANGE_SQL, billing_account_id, start_date, end_date, prefetch=prefetch
+            ):
+                yield self._row_to_transaction(row)
+
+    def _transaction_record(self, transaction: CreditTransaction) -> tuple:
+        """Convert a CreditTransaction entity to a row in _TRANSACTION_COLUMNS order."""
+        return (
+            transaction.id,
+            transaction.billing_account_id,
+            transaction.amount,
+            transaction.transaction_type.value,
+            transaction.balance_after,
+            transaction.reference_id,
+            transaction.description,
+            transaction.metadata,
+            transaction.created_at,
+        )
 
     async def create(self, transaction: CreditTransaction) -> CreditTransaction:
         """Create a new transaction record."""
-        async with self._pool.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.credit_transactions 
-                (id, billing_account_id, amount, transaction_type, balance_after,
-                 reference_id, description, metadata, created_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """,
-                transaction.id,
-                transaction.billing_account_id,
-                transaction.amount,
-                transaction.transaction_type.value,
-                transaction.balance_after,
-                transaction.reference_id,
-                transaction.description,
-                transaction.metadata,
-                transaction.created_at,
+        record = self._transaction_record(transaction)
+        await self._pool.pool.execute(_INSERT_TRANSACTION_SQL, *record)
+        return transaction
+
+    async def create_many(self, transactions: list[CreditTransaction]) -> list[CreditTransaction]:
+        """Create many transaction records in a single round trip."""
+        records = [self._transaction_record(t) for t in transactions]
+        if len(records) < TRANSACTION_COPY_THRESHOLD:
+            if records:
+                await self._pool.pool.executemany(_INSERT_TRANSACTION_SQL, records)
+        else:
+            # COPY streams rows in binary without per-row statement overhead
+            await self._pool.pool.copy_records_to_table(
+                "credit_transactions",
+                records=records,
+                columns=_TRANSACTION_COLUMNS,
+                schema_name="public",
             )
-            return transaction
+        return transactions
 
     async def get_total_by_type(
         self,
@@ -699,24 +1012,24 @@ class PostgresTransactionRepository:
         since: datetime | None = None,
     ) -> int:
         """Get the total amount for a transaction type, optionally since a date."""
-        async with self._pool.pool.acquire() as conn:
-            if since:
-                total = await conn.fetchval(
-                    """
-                    SELECT COALESCE(SUM(amount), 0) FROM public.credit_transactions 
-                    WHERE billing_account_id = $1 AND transaction_type = $2 AND created_at >= $3
-                    """,
-                    billing_account_id,
-                    transaction_type.value,
-                    since,
-                )
-            else:
-                total = await conn.fetchval(
-                    """
-                    SELECT COALESCE(SUM(amount), 0) FROM public.credit_transactions 
-                    WHERE billing_account_id = $1 AND transaction_type = $2
-                    """,
-                    billing_account_id,
-                    transaction_type.value,
-                )
-            return total or 0
+        if since:
+            total = await self._pool.pool.fetchval(
+                """
+                SELECT COALESCE(SUM(amount), 0) FROM public.credit_transactions 
+                WHERE billing_account_id = $1 AND transaction_type = $2 AND created_at >= $3
+                """,
+                billing_account_id,
+                transaction_type.value,
+                since,
+            )
+        else:
+            # All-time totals are kept up to date by a trigger on inserts
+            total = await self._pool.pool.fetchval(
+                """
+                SELECT total FROM public.credit_totals
+                WHERE billing_account_id = $1 AND transaction_type = $2
+                """,
+                billing_account_id,
+                transaction_type.value,
+            )
+        return total or 0
@@ -1,13 +1,17 @@
-from .logger import StructuredUsageLogger
+from .logger import PostgresUsageLogger, StructuredUsageLogger
 from .memory_store import (
     InMemoryAnonymousSessionStore,
     InMemoryBillingAccountStore,
     InMemoryJobStore,
 )
+from .redis_store import RedisAnonymousSessionStore, RedisJobStore
 
 __all__ = [
+    "PostgresUsageLogger",
     "StructuredUsageLogger",
     "InMemoryAnonymousSessionStore",
     "InMemoryBillingAccountStore",
     "InMemoryJobStore",
+    "RedisAnonymousSessionStore",
+    "RedisJobStore",
 ]
@@ -1,9 +1,17 @@
-import json
+import asyncio
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
+import orjson
+
+from democrata_server.adapters.storage.postgres import PostgresConnectionPool
 from democrata_server.domain.usage.entities import UsageEvent
 
 logger = logging.getLogger("democrata.usage")
+# Errors go to the module logger so they stay out of the usage event stream
+_log = logging.getLogger(__name__)
 
 
 class StructuredUsageLogger:
@@ -11,20 +19,38 @@ class StructuredUsageLogger:
 
     def __init__(self, log_level: int = logging.INFO):
         self.log_level = log_level
+        self._listener: QueueListener | None = None
         if not logger.handlers:
+            # Requests only enqueue records; a background thread writes them
+            # out, keeping stream I/O off the event loop
+            records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
             handler = logging.StreamHandler()
             handler.setFormatter(logging.Formatter("%(message)s"))
-            logger.addHandler(handler)
+            self._listener = QueueListener(records, handler)
+            self._listener.start()
+            # The listener thread is a daemon, so flush what's queued at exit
+            atexit.register(self.close)
+            logger.addHandler(QueueHandler(records))
             logger.setLevel(log_level)
 
+    def close(self) -> None:
+        """Write out any queued events and stop the background writer."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
     async def log(self, event: UsageEvent) -> None:
+        if not logger.isEnabledFor(self.log_level):
+            return
+
         log_data = {
-            "event_id": str(event.id),
+            # orjson serializes UUIDs and datetimes (as ISO 8601) natively
+            "event_id": event.id,
             "event_type": event.event_type.value,
-            "timestamp": event.timestamp.isoformat(),
-            "billing_account_id": str(event.billing_account_id),
+            "timestamp": event.timestamp,
+            "billing_account_id": event.billing_account_id,
             "session_id": event.session_id,
-            "user_id": str(event.user_id) if event.user_id else None,
+            "user_id": event.user_id,
             "cached": event.cached,
             "credits_charged": event.credits_charged,
             "cost": {
@@ -37,5 +63,94 @@ class StructuredUsageLogger:
         }
         if event.query_preview:
             log_data["query_preview"] = event.query_preview
-        
-        logger.log(self.log_level, json.dumps(log_data))
+
+        logger.log(self.log_level, orjson.dumps(log_data).decode())
+
+
+_USAGE_EVENT_COLUMNS = [
+    "id",
+    "billing_account_id",
+    "user_id",
+    "session_id",
+    "event_type",
+    "query_hash",
+    "query_preview",
+    "cached",
+    "cost_breakdown",
+    "credits_charged",
+    "created_at",
+]
+
+
+class PostgresUsageLogger:
+    """
+    Persists usage events to the usage_events table in batches.
+
+    Events are buffered and written with a single COPY once flush_interval
+    seconds have passed since the first buffered event, or as soon as
+    max_batch_size events are waiting. Call aclose() at shutdown to write
+    whatever is still buffered.
+    """
+
+    def __init__(
+        self,
+        pool: PostgresConnectionPool,
+        flush_interval: float = 0.1,
+        max_batch_size: int = 1000,
+    ):
+        self._pool = pool
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._buffer: list[tuple] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def log(self, event: UsageEvent) -> None:
+        self._buffer.append(
+            (
+                event.id,
+                event.billing_account_id,
+                event.user_id,
+                event.session_id,
+                event.event_type.value,
+                event.query_hash,
+                event.query_preview,
+                event.cached,
+                # Encoded once, by the pool's orjson jsonb codec
+                event.cost.to_dict(),
+                event.credits_charged,
+                event.timestamp,
+            )
+        )
+        if len(self._buffer) >= self.max_batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered events now."""
+        records, self._buffer = self._buffer, []
+        if not records:
+            return
+        try:
+            await self._pool.pool.copy_records_to_table(
+                "usage_events",
+                records=records,
+                columns=_USAGE_EVENT_COLUMNS,
+                schema_name="public",
+            )
+        except Exception:
+            # Usage events are analytics; credits are charged separately, so a
+            # failed write is logged rather than failing the request
+            _log.exception("Failed to write %d usage events", len(records))
+
+    async def aclose(self) -> None:
+        """Cancel the pending timed flush and write out buffered events."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
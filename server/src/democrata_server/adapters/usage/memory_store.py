@@ -1,27 +1,48 @@
+import logging
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
+from democrata_server.adapters.cache.memory import TTLCache
 from democrata_server.domain.billing.entities import BillingAccount
 from democrata_server.domain.ingestion.entities import Job
 from democrata_server.domain.usage.entities import AnonymousSession
 
+logger = logging.getLogger(__name__)
+
+# A session untouched for a day would have had its quota reset anyway
+ANONYMOUS_SESSION_TTL_SECONDS = 86400
+
+# Logged each time the number of billing accounts grows by this many
+BILLING_ACCOUNT_WATCHDOG_STEP = 100_000
+
 
 class InMemoryJobStore:
-    def __init__(self):
-        self._jobs: dict[UUID, Job] = {}
+    """In-memory job store that keeps the most recently used max_jobs jobs."""
+
+    def __init__(self, max_jobs: int = 100_000):
+        self._jobs: OrderedDict[UUID, Job] = OrderedDict()
+        self.max_jobs = max_jobs
 
     async def save(self, job: Job) -> None:
         self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
 
     async def get(self, job_id: UUID) -> Job | None:
-        return self._jobs.get(job_id)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs.move_to_end(job_id)
+        return job
 
 
 class InMemoryAnonymousSessionStore:
     """In-memory store for anonymous session tracking (rate limiting)."""
 
-    def __init__(self, daily_limit: int = 10):
-        self._sessions: dict[str, AnonymousSession] = {}
+    def __init__(self, daily_limit: int = 10, max_sessions: int = 100_000):
+        # Bounded, and sessions expire a day after they were last written
+        self._sessions = TTLCache(maxsize=max_sessions, ttl=ANONYMOUS_SESSION_TTL_SECONDS)
         self.daily_limit = daily_limit
 
     async def get(self, session_id: str) -> AnonymousSession | None:
@@ -31,11 +52,11 @@ class InMemoryAnonymousSessionStore:
         return session
 
     async def create(self, session: AnonymousSession) -> AnonymousSession:
-        self._sessions[session.session_id] = session
+        self._sessions.set(session.session_id, session)
         return session
 
     async def update(self, session: AnonymousSession) -> AnonymousSession:
-        self._sessions[session.session_id] = session
+        self._sessions.set(session.session_id, session)
         return session
 
     async def get_or_create(self, session_id: str) -> AnonymousSession:
@@ -45,6 +66,10 @@ class InMemoryAnonymousSessionStore:
             await self.create(session)
         return session
 
+    async def consume_query(self, session_id: str) -> AnonymousSession | None:
+        session = await self.get_or_create(session_id)
+        return session if session.consume_query() else None
+
 
 class InMemoryBillingAccountStore:
     """In-memory store for billing accounts (for development/testing)."""
@@ -53,6 +78,7 @@ class InMemoryBillingAccountStore:
         self._accounts_by_id: dict[UUID, BillingAccount] = {}
         self._accounts_by_user: dict[UUID, BillingAccount] = {}
         self._accounts_by_org: dict[UUID, BillingAccount] = {}
+        self._accounts_by_stripe: dict[str, BillingAccount] = {}
 
     async def get_by_id(self, account_id: UUID) -> BillingAccount | None:
         return self._accounts_by_id.get(account_id)
@@ -63,12 +89,21 @@ class InMemoryBillingAccountStore:
     async def get_by_organization_id(self, org_id: UUID) -> BillingAccount | None:
         return self._accounts_by_org.get(org_id)
 
+    def __len__(self) -> int:
+        return len(self._accounts_by_id)
+
     async def create(self, account: BillingAccount) -> BillingAccount:
+        is_new = account.id not in self._accounts_by_id
         self._accounts_by_id[account.id] = account
+        # Accounts are never evicted, so flag unexpected growth
+        if is_new and len(self) % BILLING_ACCOUNT_WATCHDOG_STEP == 0:
+            logger.warning("In-memory billing account store holds %d accounts", len(self))
         if account.user_id:
             self._accounts_by_user[account.user_id] = account
         if account.organization_id:
             self._accounts_by_org[account.organization_id] = account
+        if account.stripe_customer_id:
+            self._accounts_by_stripe[account.stripe_customer_id] = account
         return account
 
     async def update(self, account: BillingAccount) -> BillingAccount:
@@ -77,10 +112,12 @@ class InMemoryBillingAccountStore:
     async def get_by_stripe_customer_id(
         self, stripe_customer_id: str
     ) -> BillingAccount | None:
-        for account in self._accounts_by_id.values():
-            if account.stripe_customer_id == stripe_customer_id:
-                return account
-        return None
+        account = self._accounts_by_stripe.get(stripe_customer_id)
+        # Accounts are updated in place, so an entry may be stale if the
+        # customer ID has changed since it was indexed
+        if account is None or account.stripe_customer_id != stripe_customer_id:
+            return None
+        return account
 
     async def get_or_create_for_user(self, user_id: UUID) -> BillingAccount:
         """Get or create a billing account for a user."""
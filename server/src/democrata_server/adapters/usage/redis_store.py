@@ -0,0 +1,109 @@
+"""Redis-backed stores shared by every worker process."""
+
+from datetime import datetime
+from uuid import UUID
+
+from democrata_server.adapters.cache.redis import RedisCache
+from democrata_server.domain.ingestion.entities import Job
+from democrata_server.domain.usage.entities import AnonymousSession, utc_now
+
+# Long enough for clients to poll an ingestion job's final status
+JOB_TTL_SECONDS = 86400
+
+
+class RedisJobStore:
+    """Job store holding each job as a cached value for JOB_TTL_SECONDS."""
+
+    def __init__(self, cache: RedisCache, ttl_seconds: int = JOB_TTL_SECONDS):
+        self._cache = cache
+        self.ttl_seconds = ttl_seconds
+
+    async def save(self, job: Job) -> None:
+        await self._cache.set(f"job:{job.id}", job, ttl_seconds=self.ttl_seconds)
+
+    async def get(self, job_id: UUID) -> Job | None:
+        return await self._cache.get(f"job:{job_id}")
+
+
+class RedisAnonymousSessionStore:
+    """
+    Anonymous session store keeping each session in a Redis hash.
+
+    Keys expire when the session's quota resets, so every worker sees the same
+    remaining count and a new day starts with a fresh session. Requires Redis 7
+    or later for EXPIREAT's NX option.
+    """
+
+    def __init__(self, cache: RedisCache, daily_limit: int = 10):
+        self._client = cache.client
+        self.daily_limit = daily_limit
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"anon:{session_id}"
+
+    def _from_hash(self, session_id: str, data: dict[bytes, bytes]) -> AnonymousSession:
+        return AnonymousSession(
+            session_id=session_id,
+            free_tier_remaining=int(data[b"remaining"]),
+            free_tier_reset_at=datetime.fromisoformat(data[b"reset_at"].decode()),
+            created_at=datetime.fromisoformat(data[b"created_at"].decode()),
+            updated_at=datetime.fromisoformat(data[b"updated_at"].decode()),
+        )
+
+    async def get(self, session_id: str) -> AnonymousSession | None:
+        data = await self._client.hgetall(self._key(session_id))
+        return self._from_hash(session_id, data) if data else None
+
+    async def create(self, session: AnonymousSession) -> AnonymousSession:
+        return await self.update(session)
+
+    async def update(self, session: AnonymousSession) -> AnonymousSession:
+        key = self._key(session.session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "remaining": session.free_tier_remaining,
+                    "reset_at": session.free_tier_reset_at.isoformat(),
+                    "created_at": session.created_at.isoformat(),
+                    "updated_at": session.updated_at.isoformat(),
+                },
+            )
+            pipe.expireat(key, session.free_tier_reset_at)
+            await pipe.execute()
+        return session
+
+    def _queue_get_or_create(self, pipe, session_id: str) -> None:
+        # HSETNX only fills in fields of a missing session, so creating and
+        # reading happen in one round trip without racing other workers
+        fresh = AnonymousSession.create(session_id, self.daily_limit)
+        key = self._key(session_id)
+        pipe.hsetnx(key, "remaining", fresh.free_tier_remaining)
+        pipe.hsetnx(key, "reset_at", fresh.free_tier_reset_at.isoformat())
+        pipe.hsetnx(key, "created_at", fresh.created_at.isoformat())
+        pipe.hsetnx(key, "updated_at", fresh.updated_at.isoformat())
+        pipe.expireat(key, fresh.free_tier_reset_at, nx=True)
+
+    async def get_or_create(self, session_id: str) -> AnonymousSession:
+        async with self._client.pipeline(transaction=True) as pipe:
+            self._queue_get_or_create(pipe, session_id)
+            pipe.hgetall(self._key(session_id))
+            *_, data = await pipe.execute()
+        return self._from_hash(session_id, data)
+
+    async def consume_query(self, session_id: str) -> AnonymousSession | None:
+        # HINCRBY decrements in place, so concurrent requests on different
+        # workers can't both spend the same remaining query
+        key = self._key(session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            self._queue_get_or_create(pipe, session_id)
+            pipe.hincrby(key, "remaining", -1)
+            pipe.hset(key, "updated_at", utc_now().isoformat())
+            pipe.hgetall(key)
+            *_, remaining, _, data = await pipe.execute()
+        if remaining < 0:
+            # Out of queries: give back the one just taken
+            await self._client.hincrby(key, "remaining", 1)
+            return None
+        return self._from_hash(session_id, data)
@@ -1,5 +1,6 @@
 from .auth import AuthMiddleware
 from .cors import setup_cors
 from .rate_limit import RateLimitMiddleware
+from .request_scope import RequestScopeMiddleware
 
-__all__ = ["AuthMiddleware", "setup_cors", "RateLimitMiddleware"]
+__all__ = ["AuthMiddleware", "setup_cors", "RateLimitMiddleware", "RequestScopeMiddleware"]
@@ -1,53 +1,74 @@
+import logging
 import os
 import time
 from collections.abc import Callable
 
-from fastapi import HTTPException, Request
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
-from democrata_server.api.http.deps import get_session_id
+from democrata_server.adapters.cache import RedisCache
+from democrata_server.api.http.deps import get_cache, get_session_id
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting for MVP. Use Redis for production."""
+    """Per-session rate limiting with fixed one-minute windows counted in Redis."""
 
     def __init__(
         self,
         app,
         requests_per_minute: int = 30,
         protected_prefixes: list[str] | None = None,
+        cache: RedisCache | None = None,
     ):
         super().__init__(app)
         self.requests_per_minute = int(os.getenv("RATE_LIMIT_PER_MINUTE", str(requests_per_minute)))
         self.protected_prefixes = protected_prefixes or ["/rag", "/ingestion"]
-        self._requests: dict[str, list[float]] = {}
+        # str.startswith checks a tuple of prefixes in one C-level call
+        self._prefix_tuple = tuple(self.protected_prefixes)
+        # Counters live in Redis so every worker enforces the same limit
+        self.cache = cache or get_cache()
+        # Per-process counts for the current window, used while Redis is down.
+        # Monotonic time can't jump with the wall clock, and the whole dict is
+        # dropped when the window rolls over, so it never holds stale sessions.
+        self._local_window = 0
+        self._local_counts: dict[str, int] = {}
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = request.url.path
-
-        is_protected = any(path.startswith(prefix) for prefix in self.protected_prefixes)
-
-        if not is_protected:
+        if not request.url.path.startswith(self._prefix_tuple):
             return await call_next(request)
 
         session_id = get_session_id(request)
-        now = time.time()
-        window_start = now - 60
-
-        # Clean old entries and get current count
-        if session_id in self._requests:
-            self._requests[session_id] = [
-                ts for ts in self._requests[session_id] if ts > window_start
-            ]
-        else:
-            self._requests[session_id] = []
-
-        if len(self._requests[session_id]) >= self.requests_per_minute:
-            raise HTTPException(
+        window = int(time.time() // 60)
+
+        try:
+            # The key outlives its window slightly so late increments still expire
+            count = await self.cache.increment(f"rl:{session_id}:{window}", ttl_seconds=65)
+        except RedisError as e:
+            # An unavailable Redis shouldn't take the API down with it, so fall
+            # back to limiting within this process
+            logger.warning("Rate limit check failed, counting locally: %s", e)
+            count = self._increment_local(session_id)
+
+        if count > self.requests_per_minute:
+            # Returned rather than raised, since exceptions raised in middleware
+            # bypass FastAPI's HTTPException handler
+            return JSONResponse(
                 status_code=429,
-                detail="Rate limit exceeded. Please wait before making more requests.",
+                content={"detail": "Rate limit exceeded. Please wait before making more requests."},
             )
 
-        self._requests[session_id].append(now)
         return await call_next(request)
+
+    def _increment_local(self, session_id: str) -> int:
+        window = int(time.monotonic()) // 60
+        if window != self._local_window:
+            self._local_window = window
+            self._local_counts = {}
+        count = self._local_counts.get(session_id, 0) + 1
+        self._local_counts[session_id] = count
+        return count
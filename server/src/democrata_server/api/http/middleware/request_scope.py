@@ -0,0 +1,18 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from democrata_server.adapters.storage.postgres import request_scope
+
+
+class RequestScopeMiddleware:
+    """Give each HTTP request its own repository identity map."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_scope():
+            await self.app(scope, receive, send)
@@ -14,7 +14,6 @@ from democrata_server.api.http.deps import (
     get_current_user,
     get_current_user_optional,
     get_membership_repository,
-    get_organization_repository,
     get_payment_provider,
     get_transaction_repository,
 )
@@ -196,7 +195,6 @@ async def purchase_credits(
     x_organization_id: Annotated[str | None, Header()] = None,
     billing_repo=Depends(get_billing_account_repository),
     membership_repo=Depends(get_membership_repository),
-    org_repo=Depends(get_organization_repository),
     payment_provider=Depends(get_payment_provider),
 ) -> CheckoutResponse:
     """
@@ -216,8 +214,10 @@ async def purchase_credits(
     # Get billing account
     if x_organization_id:
         org_id = UUID(x_organization_id)
-        membership = await membership_repo.get_membership(current_user.id, org_id)
-        if not membership or not membership.role.can_manage_billing():
+        membership_with_org = await membership_repo.get_membership_with_org(
+            current_user.id, org_id
+        )
+        if not membership_with_org or not membership_with_org[0].role.can_manage_billing():
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to purchase credits for this organization",
@@ -228,9 +228,8 @@ async def purchase_credits(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Organization billing account not found",
             )
-        # Get org email for Stripe
-        org = await org_repo.get_by_id(org_id)
-        billing_email = org.billing_email if org else current_user.email
+        # Use the org email for Stripe
+        billing_email = membership_with_org[1].billing_email
     else:
         account = await billing_repo.get_by_user_id(current_user.id)
         if not account:
@@ -268,7 +267,6 @@ async def handle_stripe_webhook(
     request: Request,
     stripe_signature: Annotated[str, Header(alias="stripe-signature")],
     billing_repo=Depends(get_billing_account_repository),
-    transaction_repo=Depends(get_transaction_repository),
     payment_provider=Depends(get_payment_provider),
 ) -> dict:
     """
@@ -292,34 +290,37 @@ async def handle_stripe_webhook(
             detail="Missing billing account identifier",
         )
 
-    account = await billing_repo.get_by_id(UUID(billing_account_id))
-    if not account:
-        logger.error(f"Billing account not found: {billing_account_id}")
+    if result.credits <= 0:
+        logger.error(f"Webhook has invalid credit amount: {result.credits}")
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Billing account not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid credit amount",
         )
 
-    # Update Stripe customer ID if needed
-    if result.customer_id and not account.stripe_customer_id:
-        account.stripe_customer_id = result.customer_id
-
-    # Add credits
-    account.add_credits(result.credits)
-    await billing_repo.update(account)
-
-    # Record transaction
+    # Add credits, record the transaction and fill in a missing Stripe customer
+    # ID in one statement, so concurrent balance changes can't be overwritten.
+    # balance_after is set from the updated balance.
     transaction = CreditTransaction.create_purchase(
-        billing_account_id=account.id,
+        billing_account_id=UUID(billing_account_id),
         amount=result.credits,
-        balance_after=account.credits,
+        balance_after=0,
         stripe_payment_id=result.payment_id,
         credit_pack=CreditPack(
             credits=result.credits,
             price_cents=result.amount_cents,
         ),
     )
-    await transaction_repo.create(transaction)
+    account = await billing_repo.apply_transaction(
+        transaction, stripe_customer_id=result.customer_id
+    )
+    if not account:
+        # Not acknowledged, so Stripe retries the event rather than the
+        # payment going uncredited
+        logger.error(f"Billing account not found: {billing_account_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Billing account not found",
+        )
 
     logger.info(
         f"Credited {result.credits} to account {account.id}, "
@@ -338,13 +339,17 @@ async def list_transactions(
     limit: int = 50,
     offset: int = 0,
     transaction_type: str | None = None,
+    before: UUID | None = None,
     x_organization_id: Annotated[str | None, Header()] = None,
     billing_repo=Depends(get_billing_account_repository),
     transaction_repo=Depends(get_transaction_repository),
     membership_repo=Depends(get_membership_repository),
 ) -> list[TransactionResponse]:
     """
-    List credit transactions for the billing account.
+    List credit transactions for the billing account, newest first.
+
+    For deep pagination pass the last transaction's id as `before` rather
+    than increasing `offset`.
     """
     # Get billing account
     if x_organization_id:
@@ -370,6 +375,7 @@ async def list_transactions(
         limit=limit,
         offset=offset,
         transaction_type=tx_type,
+        before_id=before,
     )
 
     return [TransactionResponse.from_entity(tx) for tx in transactions]
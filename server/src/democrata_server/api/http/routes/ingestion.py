@@ -4,9 +4,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from pydantic import BaseModel
 
-from democrata_server.adapters.usage.memory_store import InMemoryJobStore
 from democrata_server.api.http.deps import get_ingest_document_use_case, get_job_store
 from democrata_server.domain.ingestion.entities import DocumentMetadata, DocumentType
+from democrata_server.domain.ingestion.ports import JobStore
 from democrata_server.domain.ingestion.use_cases import IngestDocument
 
 router = APIRouter()
@@ -76,7 +76,7 @@ async def upload(
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: str,
-    job_store: InMemoryJobStore = Depends(get_job_store),
+    job_store: JobStore = Depends(get_job_store),
 ) -> JobStatusResponse:
     try:
         uuid = UUID(job_id)
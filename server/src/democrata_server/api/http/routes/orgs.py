@@ -178,18 +178,15 @@ class UpdateMemberRoleRequest(BaseModel):
 async def list_organizations(
     current_user: Annotated[User, Depends(get_current_user)],
     membership_repo=Depends(get_membership_repository),
-    org_repo=Depends(get_organization_repository),
 ) -> list[OrganizationResponse]:
     """
     List all organizations the current user belongs to.
     """
-    memberships = await membership_repo.get_user_memberships(current_user.id)
+    memberships = await membership_repo.get_user_memberships_with_orgs(current_user.id)
     orgs = []
-    for membership in memberships:
-        org = await org_repo.get_by_id(membership.organization_id)
-        if org:
-            member_count = await membership_repo.count_members(org.id)
-            orgs.append(OrganizationResponse.from_entity(org, member_count))
+    for _, org in memberships:
+        member_count = await membership_repo.count_members(org.id)
+        orgs.append(OrganizationResponse.from_entity(org, member_count))
     return orgs
 
 
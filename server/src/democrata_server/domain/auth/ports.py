@@ -31,6 +31,10 @@ class UserRepository(Protocol):
         """Get a user by their unique identifier."""
         ...
 
+    async def get_by_ids(self, user_ids: list[UUID]) -> dict[UUID, User]:
+        """Get several users at once, keyed by id. Missing ids are omitted."""
+        ...
+
     async def get_by_email(self, email: str) -> User | None:
         """Get a user by their email address."""
         ...
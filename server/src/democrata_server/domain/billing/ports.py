@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
@@ -13,6 +14,10 @@ class BillingAccountRepository(Protocol):
         """Get a billing account by its unique identifier."""
         ...
 
+    async def get_by_ids(self, account_ids: list[UUID]) -> dict[UUID, BillingAccount]:
+        """Get several billing accounts at once, keyed by id. Missing ids are omitted."""
+        ...
+
     async def get_by_user_id(self, user_id: UUID) -> BillingAccount | None:
         """Get the billing account for a user."""
         ...
@@ -35,6 +40,15 @@ class BillingAccountRepository(Protocol):
         """Get a billing account by its Stripe customer ID."""
         ...
 
+    async def apply_transaction(
+        self, transaction: CreditTransaction, stripe_customer_id: str | None = None
+    ) -> BillingAccount | None:
+        """
+        Atomically apply a transaction's amount to its account and record it,
+        storing stripe_customer_id if the account has none yet.
+        """
+        ...
+
 
 class TransactionRepository(Protocol):
     """Repository for credit transaction history."""
@@ -49,8 +63,9 @@ class TransactionRepository(Protocol):
         limit: int = 50,
         offset: int = 0,
         transaction_type: TransactionType | None = None,
+        before_id: UUID | None = None,
     ) -> list[CreditTransaction]:
-        """Get transactions for a billing account with pagination."""
+        """Get transactions for a billing account, newest first, after an optional cursor."""
         ...
 
     async def get_by_date_range(
@@ -62,10 +77,23 @@ class TransactionRepository(Protocol):
         """Get transactions within a date range."""
         ...
 
+    def iter_by_date_range(
+        self,
+        billing_account_id: UUID,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> AsyncIterator[CreditTransaction]:
+        """Stream transactions within a date range without loading them all at once."""
+        ...
+
     async def create(self, transaction: CreditTransaction) -> CreditTransaction:
         """Create a new transaction record."""
         ...
 
+    async def create_many(self, transactions: list[CreditTransaction]) -> list[CreditTransaction]:
+        """Create many transaction records at once."""
+        ...
+
     async def get_total_by_type(
         self,
         billing_account_id: UUID,
@@ -11,6 +11,10 @@ class OrganizationRepository(Protocol):
         """Get an organization by its unique identifier."""
         ...
 
+    async def get_by_ids(self, org_ids: list[UUID]) -> dict[UUID, Organization]:
+        """Get several organizations at once, keyed by id. Missing ids are omitted."""
+        ...
+
     async def get_by_slug(self, slug: str) -> Organization | None:
         """Get an organization by its URL-friendly slug."""
         ...
@@ -43,6 +47,18 @@ class MembershipRepository(Protocol):
         """Get all memberships for a user."""
         ...
 
+    async def get_user_memberships_with_orgs(
+        self, user_id: UUID
+    ) -> list[tuple[Membership, Organization]]:
+        """Get all memberships for a user along with their organizations."""
+        ...
+
+    async def get_membership_with_org(
+        self, user_id: UUID, org_id: UUID
+    ) -> tuple[Membership, Organization] | None:
+        """Get a user's membership in an organization along with the organization."""
+        ...
+
     async def get_organization_members(self, org_id: UUID) -> list[Membership]:
         """Get all memberships in an organization."""
         ...
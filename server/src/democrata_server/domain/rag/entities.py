@@ -1,7 +1,7 @@
+import os
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
-from uuid import uuid4
 
 
 class TextFormat(str, Enum):
@@ -186,6 +186,15 @@ ComponentContent = (
 )
 
 
+def _random_uuid() -> str:
+    """Format a random (version 4) UUID string without building a uuid.UUID."""
+    data = bytearray(os.urandom(16))
+    data[6] = data[6] & 0x0F | 0x40  # Version 4
+    data[8] = data[8] & 0x3F | 0x80  # RFC 4122 variant
+    h = data.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 @dataclass
 class Component:
     id: str
@@ -196,7 +205,8 @@ class Component:
     def create(
         cls, content: ComponentContent, size: str | None = None
     ) -> "Component":
-        return cls(id=str(uuid4()), content=content, size=size)
+        # str(uuid4()) costs more than the rest of component creation combined
+        return cls(id=_random_uuid(), content=content, size=size)
 
 
 @dataclass
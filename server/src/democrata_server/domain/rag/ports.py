@@ -48,6 +48,14 @@ class Cache(Protocol):
         """Set cached value with optional TTL."""
         ...
 
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Get cached values for several keys in one lookup, in key order."""
+        ...
+
+    async def set_many(self, items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        """Set several cached values in one round-trip with optional TTL."""
+        ...
+
     async def delete(self, key: str) -> None:
         """Delete cached value."""
         ...
@@ -80,6 +80,13 @@ class AnonymousSessionStore(Protocol):
         """Get an existing session or create a new one."""
         ...
 
+    async def consume_query(self, session_id: str) -> AnonymousSession | None:
+        """
+        Atomically use one free query, creating the session if needed.
+        Returns the updated session, or None if no queries remain.
+        """
+        ...
+
 
 # Backwards compatibility alias
 UsageLogger = UsageEventRepository
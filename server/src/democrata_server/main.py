@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -10,8 +11,22 @@ project_root = Path(__file__).parent.parent.parent.parent
 load_dotenv(project_root / ".env")
 
 from democrata_server.api.http import router
-from democrata_server.api.http.deps import get_postgres_pool
+from democrata_server.api.http.deps import (
+    get_auth_provider,
+    get_cache,
+    get_context_retriever,
+    get_data_extractor,
+    get_embedder,
+    get_llm_client,
+    get_payment_provider,
+    get_postgres_pool,
+    get_query_planner,
+    get_response_composer,
+    get_response_verifier,
+    get_vector_store,
+)
 from democrata_server.api.http.middleware.cors import setup_cors
+from democrata_server.api.http.middleware.request_scope import RequestScopeMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +45,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"PostgreSQL connection failed (may not be configured): {e}")
 
+    # Build the cached query-path dependencies now, so the first request
+    # doesn't pay for constructing clients and agents
+    for get_dependency in (
+        get_cache,
+        get_vector_store,
+        get_embedder,
+        get_llm_client,
+        get_context_retriever,
+        get_query_planner,
+        get_data_extractor,
+        get_response_composer,
+        get_response_verifier,
+    ):
+        try:
+            get_dependency()
+        except Exception as e:
+            logger.warning(f"Could not initialize {get_dependency.__name__}: {e}")
+
+    # One small embedding opens the embedder's HTTP connection ahead of traffic,
+    # bounded so a slow or unreachable provider can't hold up startup
+    try:
+        await asyncio.wait_for(get_embedder().embed_single("warmup"), timeout=5)
+    except Exception as e:
+        logger.info(f"Embedder warmup skipped: {e}")
+
     yield
 
     # Shutdown
@@ -41,6 +81,13 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    # Close persistent HTTP clients held by external service adapters
+    for get_provider in (get_auth_provider, get_payment_provider):
+        try:
+            await get_provider().aclose()
+        except Exception:
+            pass
+
 
 app = FastAPI(
     title="Demócrata",
@@ -50,4 +97,5 @@ app = FastAPI(
 )
 
 setup_cors(app)
+app.add_middleware(RequestScopeMiddleware)
 app.include_router(router)
@@ -1,5 +1,8 @@
 """Tests for the agent pipeline components."""
 
+import asyncio
+
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -14,11 +17,21 @@ from democrata_server.domain.agents.entities import (
     UnsupportedClaim,
     VerificationResult,
 )
-from democrata_server.domain.rag.entities import RetrievalResult
+from democrata_server.domain.rag.entities import (
+    Component,
+    Layout,
+    Notice,
+    RetrievalResult,
+    TextBlock,
+    Timeline,
+    TimelineEvent,
+    VotingBreakdown,
+)
 from democrata_server.adapters.agents.config import AgentConfig
 from democrata_server.adapters.agents.planner import LLMQueryPlanner
 from democrata_server.adapters.agents.extractor import LLMDataExtractor
 from democrata_server.adapters.agents.retriever import IntentDrivenRetriever
+from democrata_server.adapters.agents.verifier import LLMResponseVerifier
 
 
 class TestIntentResult:
@@ -388,3 +401,168 @@ class TestIntentDrivenRetriever:
         assert filters["document_type"] == ["vote", "bill"]
         assert filters["date_from"] == "2024-01-01"
         assert filters["date_to"] == "2024-12-31"
+
+
+def _completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+
+class TestLLMResponseVerifier:
+    @pytest.fixture
+    def verifier(self):
+        return LLMResponseVerifier(api_key="test-key")
+
+    def test_serialize_response(self, verifier):
+        layout = Layout(sections=[], title="Housing")
+        components = [
+            Component.create(TextBlock(content="Rents rose 5%.")),
+            Component.create(Notice(message="Limited data")),
+            Component.create(
+                VotingBreakdown(total_for=10, total_against=4, party_breakdown=[])
+            ),
+            Component.create(
+                Timeline(events=[TimelineEvent(date="2024-01-01", label="Introduced")])
+            ),
+        ]
+
+        text = verifier._serialize_response(layout, components)
+
+        assert text.split("\n") == [
+            "Title: Housing",
+            "[TextBlock] Rents rose 5%.",
+            "[Notice] Limited data",
+            "[VotingBreakdown] Votes: 10 for, 4 against",
+            "[Timeline] Events: 2024-01-01: Introduced",
+        ]
+
+    def test_parse_verification_bare_and_fenced_json(self, verifier):
+        bare = verifier._parse_verification('{"is_valid": false, "confidence_score": 0.3}')
+        fenced = verifier._parse_verification('Result:\n```json\n{"is_valid": false}\n```')
+
+        assert bare.is_valid is False
+        assert bare.confidence_score == 0.3
+        assert fenced.is_valid is False
+
+    def test_parse_verification_invalid_json_fallback(self, verifier):
+        result = verifier._parse_verification("not json")
+
+        assert result.is_valid is True
+        assert len(result.warnings) == 1
+
+    @pytest.mark.asyncio
+    async def test_verify_reuses_cached_result(self):
+        class DictCache:
+            def __init__(self):
+                self.data = {}
+
+            async def get(self, key):
+                return self.data.get(key)
+
+            async def set(self, key, value, ttl_seconds=None):
+                self.data[key] = value
+
+        cache = DictCache()
+        verifier = LLMResponseVerifier(api_key="test-key", cache=cache)
+        verifier.client = MagicMock()
+        verifier.client.chat.completions.create = AsyncMock(
+            return_value=_completion('{"is_valid": true, "confidence_score": 0.9}')
+        )
+        layout = Layout(sections=[])
+        components = [Component.create(TextBlock(content="Rents rose 5%."))]
+
+        first = await verifier.verify(layout, components, ["Rents rose 5% in 2024."])
+        second = await verifier.verify(layout, components, ["Rents rose 5% in 2024."])
+        await verifier.verify(layout, components, ["Different context."])
+
+        assert first is second
+        assert first.confidence_score == 0.9
+        assert verifier.client.chat.completions.create.await_count == 2
+        call = verifier.client.chat.completions.create.await_args.kwargs
+        assert call["response_format"]["type"] == "json_schema"
+        assert call["messages"][0]["role"] == "system"
+        assert "Different context." in call["messages"][1]["content"]
+        assert (verifier.cache_hits, verifier.cache_misses) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_verify_survives_cache_errors(self):
+        cache = MagicMock()
+        cache.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        verifier = LLMResponseVerifier(api_key="test-key", cache=cache)
+        verifier.client = MagicMock()
+        verifier.client.chat.completions.create = AsyncMock(
+            return_value=_completion('{"is_valid": false, "confidence_score": 0.2}')
+        )
+        layout = Layout(sections=[])
+        components = [Component.create(TextBlock(content="Rents rose 5%."))]
+
+        result = await verifier.verify(layout, components, ["Rents fell in 2024."])
+
+        assert result.is_valid is False
+        assert cache.set.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_verifications_share_one_call(self):
+        verifier = LLMResponseVerifier(api_key="test-key")
+        release = asyncio.Event()
+
+        async def slow_create(**kwargs):
+            await release.wait()
+            return _completion('{"is_valid": true}')
+
+        verifier.client = MagicMock()
+        verifier.client.chat.completions.create = AsyncMock(side_effect=slow_create)
+        layout = Layout(sections=[])
+        components = [Component.create(TextBlock(content="Rents rose 5%."))]
+
+        tasks = [
+            asyncio.create_task(verifier.verify(layout, components, ["context"]))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert verifier.client.chat.completions.create.await_count == 1
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_verify_batch(self, verifier):
+        output_lines = [
+            {
+                "custom_id": "2",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": '{"is_valid": false}'}}]},
+                },
+            },
+            {"custom_id": "1", "response": {"status_code": 500, "body": {}}},
+        ]
+        verifier.client = MagicMock()
+        verifier.client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        verifier.client.batches.create = AsyncMock(
+            return_value=MagicMock(id="batch-1", status="in_progress")
+        )
+        verifier.client.batches.retrieve = AsyncMock(
+            return_value=MagicMock(id="batch-1", status="completed", output_file_id="file-out")
+        )
+        verifier.client.files.content = AsyncMock(
+            return_value=MagicMock(
+                content=b"\n".join(orjson.dumps(line) for line in output_lines)
+            )
+        )
+        layout = Layout(sections=[])
+        components = [Component.create(TextBlock(content="Rents rose 5%."))]
+
+        results = await verifier.verify_batch(
+            [(layout, components, []), (layout, components, ["a"]), (layout, components, ["b"])],
+            poll_interval_seconds=0,
+        )
+
+        uploaded = verifier.client.files.create.await_args.kwargs["file"][1]
+        assert [orjson.loads(line)["custom_id"] for line in uploaded.splitlines()] == ["1", "2"]
+        assert results[0].is_valid is True and not results[0].warnings
+        assert results[1].is_valid is True and results[1].warnings
+        assert results[2].is_valid is False
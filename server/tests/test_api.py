@@ -1,7 +1,11 @@
 import os
 import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from democrata_server.adapters.cache import RedisCache
+from democrata_server.api.http.middleware import RateLimitMiddleware
 from democrata_server.main import app
 
 
@@ -22,6 +26,41 @@ class TestHealthEndpoints:
         assert response.json() == {"status": "ready"}
 
 
+class TestRateLimitMiddleware:
+    def test_limits_protected_paths_per_window(self, monkeypatch):
+        monkeypatch.delenv("RATE_LIMIT_PER_MINUTE", raising=False)
+        cache = RedisCache()
+        cache.client = FakeAsyncRedis()
+        limited = FastAPI()
+        limited.add_middleware(RateLimitMiddleware, requests_per_minute=2, cache=cache)
+
+        @limited.get("/rag/ping")
+        @limited.get("/health")
+        def ping():
+            return {"ok": True}
+
+        client = TestClient(limited)
+        statuses = [client.get("/rag/ping").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        assert client.get("/health").status_code == 200
+
+    def test_counts_locally_when_redis_is_down(self, monkeypatch):
+        monkeypatch.delenv("RATE_LIMIT_PER_MINUTE", raising=False)
+        cache = RedisCache(url="redis://localhost:1/0")
+        limited = FastAPI()
+        limited.add_middleware(RateLimitMiddleware, requests_per_minute=1, cache=cache)
+
+        @limited.get("/rag/ping")
+        def ping():
+            return {"ok": True}
+
+        client = TestClient(limited)
+        statuses = [client.get("/rag/ping").status_code for _ in range(2)]
+
+        assert statuses == [200, 429]
+
+
 class TestIngestionEndpoints:
     def test_get_job_status_invalid_id(self, client):
         response = client.get("/ingestion/jobs/invalid-uuid")
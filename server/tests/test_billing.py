@@ -0,0 +1,174 @@
+import hashlib
+import hmac
+import time
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+import httpx
+import orjson
+import pytest
+
+from democrata_server.adapters.billing.stripe import StripePaymentProvider
+from democrata_server.adapters.usage import InMemoryBillingAccountStore, InMemoryJobStore
+from democrata_server.domain.billing.entities import BillingAccount, CreditPack
+from democrata_server.domain.ingestion.entities import Job
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def _sign(payload: bytes, timestamp: int, secret: str = WEBHOOK_SECRET) -> str:
+    signed = f"{timestamp}.".encode() + payload
+    return hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+
+
+class TestStripeWebhookSignature:
+    def setup_method(self):
+        self.provider = StripePaymentProvider("sk_test", WEBHOOK_SECRET)
+        self.payload = '{"type": "checkout.session.completed", "name": "Démocrata"}'.encode()
+        self.timestamp = int(time.time())
+
+    def test_valid_signature(self):
+        header = f"t={self.timestamp},v1={_sign(self.payload, self.timestamp)}"
+
+        assert self.provider._verify_signature(self.payload, header)
+
+    def test_any_v1_signature_may_match(self):
+        old = _sign(self.payload, self.timestamp, secret="whsec_old")
+        new = _sign(self.payload, self.timestamp)
+        header = f"t={self.timestamp},v1={old},v1={new},v0=legacy"
+
+        assert self.provider._verify_signature(self.payload, header)
+
+    def test_invalid_signature(self):
+        header = f"t={self.timestamp},v1={_sign(b'tampered', self.timestamp)}"
+
+        assert not self.provider._verify_signature(self.payload, header)
+
+    def test_malformed_header(self):
+        assert not self.provider._verify_signature(self.payload, "garbage")
+        assert not self.provider._verify_signature(self.payload, f"t={self.timestamp}")
+
+
+class TestStripeCheckout:
+    @pytest.mark.asyncio
+    async def test_create_checkout_session_form_body(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200, json={"id": "cs_1", "url": "https://checkout", "expires_at": 1700000000}
+            )
+
+        provider = StripePaymentProvider("sk_test", WEBHOOK_SECRET)
+        provider._client = httpx.AsyncClient(
+            base_url="https://api.stripe.com/v1", transport=httpx.MockTransport(handler)
+        )
+        account = BillingAccount.create_for_user(uuid4())
+        pack = CreditPack(credits=500, price_cents=500)
+
+        session = await provider.create_checkout_session(
+            account, pack, "https://app/success?x=1&y=2", "https://app/cancel"
+        )
+
+        form = parse_qs(requests[0].content.decode())
+        assert session.session_id == "cs_1"
+        assert requests[0].url.path == "/v1/checkout/sessions"
+        assert form["success_url"] == ["https://app/success?x=1&y=2"]
+        assert form["line_items[0][price_data][unit_amount]"] == ["500"]
+        assert form["line_items[0][price_data][product_data][description]"] == [
+            "Purchase 500 query credits for Demócrata"
+        ]
+        assert form["customer_creation"] == ["always"]
+
+    @pytest.mark.asyncio
+    async def test_get_checkout_session_caches_missing_session(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(404)
+
+        provider = StripePaymentProvider("sk_test", WEBHOOK_SECRET)
+        provider._client = httpx.AsyncClient(
+            base_url="https://api.stripe.com/v1", transport=httpx.MockTransport(handler)
+        )
+
+        assert await provider.get_checkout_session("cs_missing") is None
+        assert await provider.get_checkout_session("cs_missing") is None
+        assert len(requests) == 1
+
+
+class TestStripeWebhook:
+    def setup_method(self):
+        self.provider = StripePaymentProvider("sk_test", WEBHOOK_SECRET)
+
+    def _event(self, padding: str = "") -> bytes:
+        return orjson.dumps(
+            {
+                "type": "checkout.session.completed",
+                "data": {
+                    "object": {
+                        "id": "cs_1",
+                        "payment_intent": "pi_1",
+                        "payment_status": "paid",
+                        "amount_total": 500,
+                        "customer": "cus_1",
+                        "metadata": {"billing_account_id": "acct", "credits": "500"},
+                        "padding": padding,
+                    }
+                },
+            }
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("padding", ["", "x" * 40_000])
+    async def test_verify_webhook(self, padding):
+        payload = self._event(padding)
+        timestamp = int(time.time())
+        header = f"t={timestamp},v1={_sign(payload, timestamp)}"
+
+        result = await self.provider.verify_webhook(payload, header)
+
+        assert result is not None
+        assert result.payment_id == "pi_1"
+        assert result.credits == 500
+
+    @pytest.mark.asyncio
+    async def test_verify_webhook_rejects_bad_signature_on_large_payload(self):
+        payload = b"{" * 40_000
+
+        assert await self.provider.verify_webhook(payload, "t=1,v1=bad") is None
+
+
+class TestInMemoryBillingAccountStore:
+    @pytest.mark.asyncio
+    async def test_get_by_stripe_customer_id_follows_updates(self):
+        store = InMemoryBillingAccountStore()
+        account = await store.get_or_create_for_user(uuid4())
+        assert await store.get_by_stripe_customer_id("cus_1") is None
+
+        account.stripe_customer_id = "cus_1"
+        await store.update(account)
+        assert await store.get_by_stripe_customer_id("cus_1") is account
+
+        account.stripe_customer_id = "cus_2"
+        await store.update(account)
+        assert await store.get_by_stripe_customer_id("cus_1") is None
+        assert await store.get_by_stripe_customer_id("cus_2") is account
+
+
+class TestInMemoryJobStore:
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_job(self):
+        store = InMemoryJobStore(max_jobs=2)
+        jobs = [Job.create() for _ in range(3)]
+
+        await store.save(jobs[0])
+        await store.save(jobs[1])
+        await store.get(jobs[0].id)
+        await store.save(jobs[2])
+
+        assert await store.get(jobs[0].id) is jobs[0]
+        assert await store.get(jobs[1].id) is None
+        assert await store.get(jobs[2].id) is jobs[2]
@@ -0,0 +1,282 @@
+import asyncio
+import base64
+import json
+import pickle
+import time
+
+import httpx
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from democrata_server.adapters.auth.supabase import SupabaseAuthProvider
+from democrata_server.adapters.cache import RedisCache, TTLCache, codec
+from democrata_server.adapters.usage import RedisAnonymousSessionStore, RedisJobStore
+from democrata_server.domain.ingestion.entities import Job, JobStatus
+from democrata_server.domain.rag.entities import (
+    Component,
+    Layout,
+    Notice,
+    NoticeLevel,
+    Query,
+    QueryFilters,
+    QueryMetadata,
+    RAGResult,
+    Section,
+    TextBlock,
+)
+from democrata_server.domain.usage.entities import CostBreakdown
+
+USER_DATA = {
+    "id": "00000000-0000-0000-0000-000000000001",
+    "email": "a@example.com",
+    "created_at": "2025-01-01T00:00:00Z",
+}
+
+
+def _make_jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def _make_result() -> RAGResult:
+    components = [
+        Component.create(TextBlock(content="Summary", title="Overview")),
+        Component.create(Notice(message="Limited data", level=NoticeLevel.WARNING)),
+    ]
+    return RAGResult(
+        layout=Layout(sections=[Section(component_ids=[c.id for c in components])]),
+        components=components,
+        metadata=QueryMetadata(
+            documents_retrieved=2, chunks_used=3, processing_time_ms=10, model="test"
+        ),
+        cost=CostBreakdown(total_cents=5, total_credits=5),
+    )
+
+
+class TestCacheCodec:
+    def test_round_trips_rag_result_as_json(self):
+        result = _make_result()
+
+        data = codec.encode(result)
+        decoded = codec.decode(data)
+
+        assert data[:1] == codec.ORJSON_TAG
+        assert decoded == result
+        assert decoded.components[1].content.level is NoticeLevel.WARNING
+
+    def test_falls_back_to_pickle_for_non_json_values(self):
+        value = {1: b"bytes"}
+
+        data = codec.encode(value)
+
+        assert data[:1] == codec.PICKLE_TAG
+        assert codec.decode(data) == value
+
+    def test_compresses_large_payloads(self):
+        result = _make_result()
+        result.components[0].content.content = "Lorem ipsum " * 500
+
+        data = codec.encode(result)
+
+        assert data[:1] == codec.ZSTD_TAG
+        assert len(data) < codec.COMPRESSION_THRESHOLD
+        assert codec.decode(data) == result
+
+    def test_decodes_legacy_pickle_payload(self):
+        result = _make_result()
+
+        assert codec.decode(pickle.dumps(result)) == result
+
+
+class TestRedisCache:
+    @pytest.mark.asyncio
+    async def test_get_many_and_set_many(self):
+        cache = RedisCache()
+        cache.client = FakeAsyncRedis()
+        result = _make_result()
+
+        await cache.set_many({"a": result, "b": {"count": 1}}, ttl_seconds=60)
+
+        assert await cache.get_many(["a", "missing", "b"]) == [result, None, {"count": 1}]
+        assert await cache.get_many([]) == []
+        assert 0 < await cache.client.ttl("a") <= 60
+
+    @pytest.mark.asyncio
+    async def test_increment_counts_and_expires(self):
+        cache = RedisCache()
+        cache.client = FakeAsyncRedis()
+
+        assert await cache.increment("rl:a:1", ttl_seconds=65) == 1
+        assert await cache.increment("rl:a:1", ttl_seconds=65) == 2
+        assert 0 < await cache.client.ttl("rl:a:1") <= 65
+
+    def test_query_key_is_stable(self):
+        cache = RedisCache()
+        filters = QueryFilters(document_types=["bill"], sources=["hansard"])
+
+        key = cache.query_key(Query(text="housing", session_id="a", filters=filters))
+        same = cache.query_key(Query(text="housing", session_id="b", filters=filters))
+        other = cache.query_key(Query(text="housing"))
+
+        assert key == same
+        assert key != other
+        assert key.startswith("rag:q:v2:")
+        assert len(key.rsplit(":", 1)[1]) == 32
+
+
+class TestRedisStores:
+    def _cache(self) -> RedisCache:
+        cache = RedisCache()
+        cache.client = FakeAsyncRedis()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_job_round_trips(self):
+        store = RedisJobStore(self._cache())
+        job = Job.create()
+        job.complete(documents=1, chunks=3)
+
+        await store.save(job)
+
+        assert await store.get(job.id) == job
+        assert (await store.get(job.id)).status is JobStatus.SUCCESS
+        assert await store.get(Job.create().id) is None
+
+    @pytest.mark.asyncio
+    async def test_anonymous_session_is_shared_and_expires_at_reset(self):
+        cache = self._cache()
+        store = RedisAnonymousSessionStore(cache, daily_limit=3)
+
+        session = await store.get_or_create("abc")
+        assert session.free_tier_remaining == 3
+        session.consume_query()
+        await store.update(session)
+
+        other_worker = RedisAnonymousSessionStore(cache, daily_limit=3)
+        again = await other_worker.get_or_create("abc")
+        assert again.free_tier_remaining == 2
+        assert again.free_tier_reset_at == session.free_tier_reset_at
+        assert 0 < await cache.client.ttl("anon:abc") <= 86400
+        assert await store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_consumption_stops_at_daily_limit(self):
+        cache = self._cache()
+        workers = [RedisAnonymousSessionStore(cache, daily_limit=3) for _ in range(2)]
+
+        results = await asyncio.gather(
+            *(workers[i % 2].consume_query("abc") for i in range(5))
+        )
+
+        assert sum(r is not None for r in results) == 3
+        assert (await workers[0].get("abc")).free_tier_remaining == 0
+
+
+class TestTTLCache:
+    def test_get_missing_returns_default(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        sentinel = object()
+
+        assert cache.get("missing") is None
+        assert cache.get("missing", sentinel) is sentinel
+
+    def test_set_and_get(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", None)
+
+        assert cache.get("a", "default") is None
+        assert len(cache) == 1
+
+    def test_expired_entry_is_dropped(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1, ttl=0)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestSupabaseUserCache:
+    def _provider(self, handler) -> tuple[SupabaseAuthProvider, list[httpx.Request]]:
+        requests: list[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return handler(request)
+
+        provider = SupabaseAuthProvider("https://example.supabase.co", "anon")
+        provider._client = httpx.AsyncClient(
+            base_url=provider._auth_url, transport=httpx.MockTransport(record)
+        )
+        return provider, requests
+
+    @pytest.mark.asyncio
+    async def test_valid_token_is_cached(self):
+        provider, requests = self._provider(lambda r: httpx.Response(200, json=USER_DATA))
+        token = _make_jwt(time.time() + 3600)
+
+        first = await provider.get_user(token)
+        second = await provider.get_user(token)
+
+        assert first is second
+        assert first.created_at.tzinfo is not None
+        assert first.updated_at == first.created_at
+        assert len(requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_token_near_expiry_is_not_cached(self):
+        provider, requests = self._provider(lambda r: httpx.Response(200, json=USER_DATA))
+        token = _make_jwt(time.time() + 5)
+
+        await provider.get_user(token)
+        await provider.get_user(token)
+
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_cached_and_invalidated(self):
+        provider, requests = self._provider(lambda r: httpx.Response(401))
+        token = _make_jwt(time.time() + 3600)
+
+        assert await provider.get_user(token) is None
+        assert await provider.get_user(token) is None
+        assert len(requests) == 1
+
+        provider.invalidate(token)
+        await provider.get_user(token)
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_session_seeds_user_cache(self):
+        access_token = _make_jwt(time.time() + 3600)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/token"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "access_token": access_token,
+                        "refresh_token": "refresh-2",
+                        "expires_at": int(time.time()) + 3600,
+                        "user": USER_DATA,
+                    },
+                )
+            return httpx.Response(500)
+
+        provider, requests = self._provider(handler)
+
+        session = await provider.refresh_session("refresh-1")
+        user = await provider.get_user(access_token)
+
+        assert user is session.user
+        assert len(requests) == 1
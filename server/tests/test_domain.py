@@ -1,5 +1,5 @@
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from democrata_server.domain.ingestion.entities import (
     Chunk,
@@ -9,6 +9,7 @@ from democrata_server.domain.ingestion.entities import (
     Job,
     JobStatus,
 )
+from democrata_server.domain.rag.entities import Component, TextBlock
 from democrata_server.domain.usage.entities import CostBreakdown, UsageEvent
 
 
@@ -35,6 +36,17 @@ class TestDocumentEntities:
         assert chunk.position == 0
 
 
+class TestComponentEntities:
+    def test_create_component_assigns_uuid4_id(self):
+        first = Component.create(TextBlock(content="a"), size="half")
+        second = Component.create(TextBlock(content="b"))
+
+        assert str(UUID(first.id)) == first.id
+        assert UUID(first.id).version == 4
+        assert first.id != second.id
+        assert first.size == "half"
+
+
 class TestJobLifecycle:
     def test_job_creation(self):
         job = Job.create()
@@ -0,0 +1,324 @@
+"""Tests for shared LLM response parsing and the LLM clients."""
+
+import httpx
+import orjson
+import pytest
+
+from democrata_server.adapters.llm.components import (
+    SYSTEM_PROMPT,
+    SYSTEM_PROMPT_EXAMPLES,
+    TYPE_ALIASES,
+    build_system_prompt,
+    build_user_message,
+    extract_json,
+    parse_component,
+    parse_components,
+    validate_response,
+)
+from democrata_server.adapters.llm.constraints import (
+    ConstraintViolation,
+    validate_chart,
+    validate_voting_breakdown,
+)
+from democrata_server.adapters.llm.ollama_client import OllamaLLMClient
+from democrata_server.domain.rag.entities import ChartType, Notice, NoticeLevel, TextBlock
+
+
+class TestValidateResponse:
+    def test_accepts_valid_response(self):
+        validate_response(
+            {
+                "title": "Housing",
+                "subtitle": None,
+                "sections": [
+                    {"layout": "grid", "components": [{"type": "chart", "size": "half"}]},
+                    {"layout": None, "components": [{"type": "text_block", "size": None}]},
+                ],
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"sections": []},
+            {"title": "Housing", "sections": [{"components": [{"type": "graph"}]}]},
+            {"title": "Housing", "sections": [{"layout": "columns", "components": []}]},
+        ],
+    )
+    def test_rejects_invalid_response(self, payload):
+        with pytest.raises(ValueError):
+            validate_response(payload)
+
+
+class TestParseComponent:
+    def test_dispatches_on_aliased_type(self):
+        component = parse_component({"type": "Text-Block", "content": " Summary ", "size": "half"})
+
+        assert isinstance(component.content, TextBlock)
+        assert component.content.content == "Summary"
+        assert component.size == "half"
+
+    def test_parses_notice_level(self):
+        component = parse_component({"type": "alert", "message": "Heads up", "level": "warning"})
+
+        assert isinstance(component.content, Notice)
+        assert component.content.level is NoticeLevel.WARNING
+
+    def test_unknown_type_returns_none(self):
+        assert parse_component({"type": "carousel"}) is None
+
+    def test_resolves_canonical_and_aliased_types(self):
+        assert TYPE_ALIASES["chart"] == "chart"
+        assert TYPE_ALIASES["table"] == "data_table"
+        assert parse_component({"type": " Notice ", "message": "Heads up"}) is not None
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {
+                "type": "chart",
+                "series": [
+                    {"name": "s", "data": [{"label": "a", "value": 1}, {"label": "b", "value": 2}]}
+                ],
+            },
+            {"type": "timeline", "events": [{"date": "2024"}, {"label": "Second reading"}]},
+            {
+                "type": "data_table",
+                "columns": [{"header": "Name"}, {"key": "party"}],
+                "rows": [{"name": "A", "party": "X"}, {"name": "B", "party": "Y"}],
+            },
+            {
+                "type": "comparison",
+                "items": [{"name": "Labor"}, {"name": "Greens"}],
+                "attributes": [{"name": "Tax", "values": ["Up", "Down"]}],
+            },
+            {"type": "member_profiles", "members": [{"name": "Jane Smith"}]},
+            {"type": "voting_breakdown", "total_for": 3, "total_against": 1},
+        ],
+    )
+    def test_parses_minimal_valid_components(self, data):
+        assert parse_component(data) is not None
+
+    def test_insufficient_data_returns_none(self):
+        assert parse_component({"type": "chart", "series": [{"name": "s", "data": []}]}) is None
+        assert parse_component({"type": "timeline", "events": [{"description": "x"}]}) is None
+
+    def test_unknown_chart_type_falls_back_to_bar(self):
+        points = [{"label": "a", "value": 1}, {"label": "b", "value": 2}]
+        component = parse_component(
+            {"type": "chart", "chart_type": "radar", "series": [{"name": "s", "data": points}]}
+        )
+
+        assert component.content.chart_type is ChartType.BAR
+
+    def test_voting_breakdown_totals_derived_from_parties(self):
+        component = parse_component(
+            {
+                "type": "voting_breakdown",
+                "party_breakdown": [
+                    {"party": "Labor", "votes_for": 68, "votes_against": 2, "abstentions": 1},
+                    {"party": "Greens", "votes_for": 12, "votes_against": 0},
+                    {"votes_for": 99},
+                ],
+            }
+        )
+
+        assert component.content.total_for == 80
+        assert component.content.total_against == 2
+        assert component.content.total_abstentions == 1
+
+    def test_voting_breakdown_keeps_explicit_totals(self):
+        component = parse_component(
+            {
+                "type": "voting_breakdown",
+                "total_for": 85,
+                "total_against": 60,
+                "party_breakdown": [{"party": "Labor", "votes_for": 68}],
+            }
+        )
+
+        assert component.content.total_for == 85
+        assert component.content.total_against == 60
+
+    def test_member_roles_default_to_empty_list(self):
+        component = parse_component(
+            {
+                "type": "member_profiles",
+                "members": [{"name": "Jane Smith", "roles": ["Minister"]}, {"name": "John Doe"}],
+            }
+        )
+
+        assert [m.roles for m in component.content.members] == [["Minister"], []]
+
+
+def _series(*values) -> dict:
+    return {"name": "s", "data": [{"label": str(v), "value": v} for v in values]}
+
+
+class TestValidateChart:
+    def test_accepts_valid_charts(self):
+        assert validate_chart({"series": [_series(1, 2)]}).is_valid
+        assert validate_chart({"chart_type": "line", "series": [_series(1, 2, 3)]}).is_valid
+        # Only the first series is drawn in a pie chart
+        pie = {"chart_type": "pie", "series": [_series(1, 2), _series(-1)]}
+        assert validate_chart(pie).is_valid
+
+    @pytest.mark.parametrize(
+        ("data", "violation"),
+        [
+            ({"series": []}, ConstraintViolation.INSUFFICIENT_DATA),
+            ({"series": [_series(1)]}, ConstraintViolation.INSUFFICIENT_DATA),
+            ({"series": [_series(1, "n/a")]}, ConstraintViolation.INVALID_STRUCTURE),
+            ({"series": [_series(1, None)]}, ConstraintViolation.INVALID_STRUCTURE),
+            ({"chart_type": "pie", "series": [_series(1, -2)]}, ConstraintViolation.POOR_FIT),
+            ({"chart_type": "pie", "series": [_series(*range(8))]}, ConstraintViolation.POOR_FIT),
+            (
+                {"chart_type": "line", "series": [_series(1, 2, 3), _series(1, 2)]},
+                ConstraintViolation.POOR_FIT,
+            ),
+        ],
+    )
+    def test_rejects_invalid_charts(self, data, violation):
+        result = validate_chart(data)
+
+        assert not result.is_valid
+        assert result.violation is violation
+
+
+class TestValidateVotingBreakdown:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"total_for": 3, "total_against": 0},
+            {"total_for": "3"},
+            {"party_breakdown": [{"party": "", "votes_for": 4}, {"party": "Lab", "votes_for": 2}]},
+            {"party_breakdown": [{"party": "Labor", "votes_for": 0, "votes_against": "1"}]},
+        ],
+    )
+    def test_accepts_votes(self, data):
+        assert validate_voting_breakdown(data).is_valid
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"total_for": 0, "party_breakdown": [{"party": "Labor", "votes_for": 0}]},
+            {"party_breakdown": [{"votes_for": 5}]},
+        ],
+    )
+    def test_rejects_missing_votes(self, data):
+        result = validate_voting_breakdown(data)
+
+        assert not result.is_valid
+        assert result.violation is ConstraintViolation.INSUFFICIENT_DATA
+
+
+class TestParseComponents:
+    def test_drops_invalid_components_in_order(self):
+        components = parse_components(
+            [
+                {"type": "text_block", "content": "First"},
+                {"type": "chart", "series": []},
+                {"type": "carousel"},
+                {"type": "notice", "message": "Second"},
+            ]
+        )
+
+        assert [type(c.content) for c in components] == [TextBlock, Notice]
+
+
+class TestExtractJson:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '{"a": 1}',
+            '```json\n{"a": 1}\n```',
+            'Here you go:\n```\n{"a": 1}\n```\nThanks',
+            '```json\n{"a": 1}',
+        ],
+    )
+    def test_extracts_json_body(self, content):
+        assert orjson.loads(extract_json(content)) == {"a": 1}
+
+
+class TestSystemPrompt:
+    def test_examples_are_optional(self):
+        core = build_system_prompt(include_examples=False)
+
+        assert build_system_prompt() == SYSTEM_PROMPT
+        assert SYSTEM_PROMPT_EXAMPLES in SYSTEM_PROMPT
+        assert "EXAMPLE COMPLETE RESPONSES" not in core
+        assert "CONTENT GUIDELINES" in core
+
+
+class TestBuildUserMessage:
+    def test_joins_context_chunks(self):
+        message = build_user_message("housing?", ["First", "Second"])
+
+        assert message.startswith("Context from political documents:\n\nFirst\n\n---\n\nSecond")
+        assert "User question: housing?" in message
+        assert message.endswith("Respond with a JSON object as specified.")
+
+    def test_without_context(self):
+        assert "No context available." in build_user_message("housing?", [])
+
+
+class TestOllamaLLMClient:
+    def _client(self, requests: list[httpx.Request]) -> OllamaLLMClient:
+        content = orjson.dumps(
+            {
+                "title": "Housing",
+                "sections": [{"components": [{"type": "text_block", "content": "Hi"}]}],
+            }
+        ).decode()
+
+        half = len(content) // 2
+        stream = b"\n".join(
+            [
+                orjson.dumps({"message": {"content": content[:half]}, "done": False}),
+                orjson.dumps({"message": {"content": content[half:]}, "done": False}),
+                orjson.dumps(
+                    {
+                        "message": {"content": ""},
+                        "done": True,
+                        "prompt_eval_count": 10,
+                        "eval_count": 5,
+                    }
+                ),
+            ]
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=stream)
+
+        client = OllamaLLMClient()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_sends_default_system_prompt(self):
+        requests: list[httpx.Request] = []
+        client = self._client(requests)
+
+        layout, components, usage = await client.generate_response("housing?", ["ctx"])
+
+        body = orjson.loads(requests[0].content)
+        assert body["messages"][0] == {"role": "system", "content": SYSTEM_PROMPT}
+        assert body["format"]["required"] == ["title", "sections"]
+        assert body["stream"] is True
+        assert requests[0].headers["content-type"] == "application/json"
+        assert layout.title == "Housing"
+        assert len(components) == 1
+        assert usage["input_tokens"] == 10
+        assert usage["output_tokens"] == 5
+
+    @pytest.mark.asyncio
+    async def test_sends_custom_system_prompt(self):
+        requests: list[httpx.Request] = []
+        client = self._client(requests)
+
+        await client.generate_response("housing?", [], system_prompt="Be brief")
+
+        body = orjson.loads(requests[0].content)
+        assert body["messages"][0]["content"] == "Be brief"
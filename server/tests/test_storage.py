@@ -0,0 +1,257 @@
+"""Tests for the PostgreSQL repository adapters."""
+
+import asyncio
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from democrata_server.adapters.storage.batch import BatchLoader
+from democrata_server.adapters.storage.postgres import (
+    PostgresBillingAccountRepository,
+    PostgresMembershipRepository,
+    PostgresOrganizationRepository,
+    request_scope,
+)
+from democrata_server.adapters.usage.logger import PostgresUsageLogger
+from democrata_server.domain.billing.entities import CreditTransaction
+from democrata_server.domain.orgs.entities import MemberRole
+from democrata_server.domain.usage.entities import CostBreakdown, UsageEvent
+
+
+class _FakePool:
+    """Stands in for PostgresConnectionPool, counting the queries made."""
+
+    def __init__(self, *rows: dict):
+        self.rows = list(rows)
+        self.queries = 0
+        self.args: tuple = ()
+
+    @property
+    def pool(self):
+        return self
+
+    async def fetchrow(self, query, *args):
+        self.queries += 1
+        self.args = args
+        return self.rows[0] if self.rows else None
+
+    async def fetch(self, query, *args):
+        # Batched lookups pass their ids as the first argument
+        self.queries += 1
+        self.args = args
+        return [row for row in self.rows if row["id"] in args[0]]
+
+    async def execute(self, query, *args):
+        self.queries += 1
+
+    async def copy_records_to_table(self, table, *, records, columns, schema_name):
+        self.queries += 1
+        self.args = (table, records)
+
+
+def _org_row() -> dict:
+    now = datetime.now(UTC)
+    return {
+        "id": uuid4(),
+        "name": "Acme",
+        "slug": "acme",
+        "owner_id": uuid4(),
+        "billing_email": None,
+        "plan": "free",
+        "max_seats": 5,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class TestRequestScope:
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_is_served_from_scope(self):
+        row = _org_row()
+        pool = _FakePool(row)
+        repo = PostgresOrganizationRepository(pool)
+
+        with request_scope():
+            first = await repo.get_by_id(row["id"])
+            second = await repo.get_by_id(row["id"])
+
+        assert second is first
+        assert pool.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_cached_outside_a_scope(self):
+        row = _org_row()
+        pool = _FakePool(row)
+        repo = PostgresOrganizationRepository(pool)
+
+        await repo.get_by_id(row["id"])
+        await repo.get_by_id(row["id"])
+
+        assert pool.queries == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_entities_and_deletes_are_not_cached(self):
+        row = _org_row()
+        pool = _FakePool()
+        repo = PostgresOrganizationRepository(pool)
+
+        with request_scope():
+            assert await repo.get_by_id(row["id"]) is None
+            pool.rows = [row]
+            assert await repo.get_by_id(row["id"]) is not None
+            await repo.delete(row["id"])
+            pool.rows = []
+            assert await repo.get_by_id(row["id"]) is None
+
+
+class TestGetByIds:
+    @pytest.mark.asyncio
+    async def test_fetches_only_ids_missing_from_scope(self):
+        cached, fetched = _org_row(), _org_row()
+        pool = _FakePool(cached, fetched)
+        repo = PostgresOrganizationRepository(pool)
+        absent = uuid4()
+
+        with request_scope():
+            await repo.get_by_id(cached["id"])
+            organizations = await repo.get_by_ids([cached["id"], fetched["id"], absent])
+
+        assert set(organizations) == {cached["id"], fetched["id"]}
+        assert pool.args == ([fetched["id"], absent],)
+        assert pool.queries == 2
+
+
+class TestGetMembershipWithOrg:
+    @pytest.mark.asyncio
+    async def test_splits_joined_row(self):
+        org = _org_row()
+        row = {f"org_{key}": value for key, value in org.items()}
+        row.update(
+            id=uuid4(),
+            user_id=uuid4(),
+            organization_id=org["id"],
+            role="admin",
+            invited_by=None,
+            joined_at=org["created_at"],
+        )
+        repo = PostgresMembershipRepository(_FakePool(row))
+
+        membership, organization = await repo.get_membership_with_org(row["user_id"], org["id"])
+
+        assert membership.id == row["id"]
+        assert membership.role is MemberRole.ADMIN
+        assert organization.id == org["id"]
+        assert organization.slug == "acme"
+
+    @pytest.mark.asyncio
+    async def test_returns_none_for_non_member(self):
+        repo = PostgresMembershipRepository(_FakePool())
+
+        assert await repo.get_membership_with_org(uuid4(), uuid4()) is None
+
+
+class TestBatchLoader:
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_share_one_batch(self):
+        batches: list[list[int]] = []
+
+        async def load_many(keys: list[int]) -> dict[int, str]:
+            batches.append(keys)
+            return {key: str(key) for key in keys if key != 3}
+
+        loader = BatchLoader(load_many)
+        results = await asyncio.gather(*(loader.load(key) for key in (1, 2, 1, 3)))
+
+        assert results == ["1", "2", "1", None]
+        assert batches == [[1, 2, 3]]
+        assert await loader.load(4) == "4"
+        assert batches[-1] == [4]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_every_load(self):
+        async def load_many(keys: list[int]) -> dict[int, str]:
+            raise RuntimeError("down")
+
+        loader = BatchLoader(load_many)
+        results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_repository_batches_concurrent_get_by_id(self):
+        first, second = _org_row(), _org_row()
+        pool = _FakePool(first, second)
+        repo = PostgresOrganizationRepository(pool)
+
+        organizations = await asyncio.gather(
+            repo.get_by_id(first["id"]), repo.get_by_id(second["id"])
+        )
+
+        assert [o.id for o in organizations] == [first["id"], second["id"]]
+        assert pool.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_of_one_key_get_separate_copies(self):
+        row = _org_row()
+        pool = _FakePool(row)
+        repo = PostgresOrganizationRepository(pool)
+
+        first, second = await asyncio.gather(repo.get_by_id(row["id"]), repo.get_by_id(row["id"]))
+        first.name = "Renamed"
+
+        assert first is not second
+        assert second.name == "Acme"
+        assert pool.queries == 1
+
+
+class TestApplyTransaction:
+    @pytest.mark.asyncio
+    async def test_missing_account_returns_none(self):
+        pool = _FakePool()
+        repo = PostgresBillingAccountRepository(pool)
+        transaction = CreditTransaction.create_purchase(
+            billing_account_id=uuid4(), amount=500, balance_after=0, stripe_payment_id="pi_1"
+        )
+
+        account = await repo.apply_transaction(transaction, stripe_customer_id="cus_1")
+
+        assert account is None
+        assert pool.queries == 1
+        assert pool.args[-1] == "cus_1"
+
+
+def _usage_event() -> UsageEvent:
+    return UsageEvent.create_ingestion_event(uuid4(), CostBreakdown.zero())
+
+
+class TestPostgresUsageLogger:
+    @pytest.mark.asyncio
+    async def test_buffered_events_are_copied_in_one_batch(self):
+        pool = _FakePool()
+        usage_logger = PostgresUsageLogger(pool, flush_interval=0.01)
+        events = [_usage_event() for _ in range(3)]
+
+        for event in events:
+            await usage_logger.log(event)
+        assert pool.queries == 0
+
+        await asyncio.sleep(0.05)
+
+        table, records = pool.args
+        assert table == "usage_events"
+        assert [record[0] for record in records] == [event.id for event in events]
+        assert pool.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_and_close_flush_immediately(self):
+        pool = _FakePool()
+        usage_logger = PostgresUsageLogger(pool, max_batch_size=2)
+
+        for _ in range(3):
+            await usage_logger.log(_usage_event())
+        assert pool.queries == 1
+
+        await usage_logger.aclose()
+        assert pool.queries == 2
+        assert len(pool.args[1]) == 1
@@ -0,0 +1,13 @@
+-- Covering index for per-user membership lookups
+-- Lets get_user_memberships and the membership-based RLS policies
+-- (organization_id/role by user_id) be answered by index-only scans.
+
+-- =============================================================================
+-- Memberships
+-- =============================================================================
+CREATE INDEX IF NOT EXISTS idx_memberships_user_id_covering
+    ON public.memberships(user_id)
+    INCLUDE (id, organization_id, role, invited_by, joined_at);
+
+-- Superseded by the covering index above
+DROP INDEX IF EXISTS idx_memberships_user_id;
@@ -0,0 +1,12 @@
+-- Keyset pagination index for credit transaction history
+-- Transaction history pages are ordered by (created_at, id) within an account
+-- so the next page can seek directly past the previous page's last row.
+
+-- =============================================================================
+-- Credit Transactions
+-- =============================================================================
+CREATE INDEX IF NOT EXISTS idx_credit_transactions_billing_account_created_id
+    ON public.credit_transactions(billing_account_id, created_at DESC, id DESC);
+
+-- Superseded by the index above, which also serves date range queries
+DROP INDEX IF EXISTS idx_credit_transactions_billing_account_created;
@@ -0,0 +1,42 @@
+-- Running credit totals per billing account and transaction type
+-- Maintained by trigger on credit_transactions so all-time totals are a
+-- primary key lookup rather than a SUM over the account's full history.
+
+-- =============================================================================
+-- Credit Totals
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS public.credit_totals (
+    billing_account_id uuid NOT NULL REFERENCES public.billing_accounts(id),
+    transaction_type transaction_type NOT NULL,
+    total bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz DEFAULT now(),
+    PRIMARY KEY (billing_account_id, transaction_type)
+);
+
+ALTER TABLE public.credit_totals ENABLE ROW LEVEL SECURITY;
+
+-- Transactions are append-only, so only inserts need to be rolled up
+CREATE OR REPLACE FUNCTION add_to_credit_totals()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.credit_totals (billing_account_id, transaction_type, total)
+    VALUES (NEW.billing_account_id, NEW.transaction_type, NEW.amount)
+    ON CONFLICT (billing_account_id, transaction_type)
+    DO UPDATE SET total = public.credit_totals.total + EXCLUDED.total, updated_at = now();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS add_to_credit_totals ON public.credit_transactions;
+CREATE TRIGGER add_to_credit_totals
+    AFTER INSERT ON public.credit_transactions
+    FOR EACH ROW
+    EXECUTE FUNCTION add_to_credit_totals();
+
+-- Backfill from existing transactions
+INSERT INTO public.credit_totals (billing_account_id, transaction_type, total)
+SELECT billing_account_id, transaction_type, SUM(amount)
+FROM public.credit_transactions
+GROUP BY billing_account_id, transaction_type
+ON CONFLICT (billing_account_id, transaction_type)
+DO UPDATE SET total = EXCLUDED.total, updated_at = now();
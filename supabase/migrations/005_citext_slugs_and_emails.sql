@@ -0,0 +1,23 @@
+-- Case-insensitive organization slugs and invitation emails
+-- Lookups compare case-insensitively in the database, so callers no longer
+-- need to lowercase before querying. Values are still stored lowercased.
+
+CREATE EXTENSION IF NOT EXISTS citext;
+
+-- =============================================================================
+-- Organizations
+-- =============================================================================
+ALTER TABLE public.organizations ALTER COLUMN slug TYPE citext USING slug::citext;
+
+-- =============================================================================
+-- Invitations
+-- =============================================================================
+-- The column can't change type while a policy references it
+DROP POLICY IF EXISTS "Users can view own invitations" ON public.invitations;
+
+ALTER TABLE public.invitations ALTER COLUMN email TYPE citext USING email::citext;
+
+CREATE POLICY "Users can view own invitations" ON public.invitations
+    FOR SELECT USING (
+        email = (SELECT email FROM auth.users WHERE id = auth.uid())::citext
+    );